@@ -1,27 +1,393 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, has_request_context, g
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import datetime # Podrías necesitar instalar esta librería (pip install pytz)
 import sqlite3
-from datetime import datetime
+from datetime import datetime, timedelta
 import os
+import sys
+import re
+import json
+import time
+import logging
+import threading
+import click
+import hashlib
+import functools
+import random
+import atexit
+import mmap
+import struct
+from collections import OrderedDict
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+try:
+    import fcntl
+except ImportError:  # Windows: sin bloqueo entre procesos
+    fcntl = None
 
 app = Flask(__name__)
-CORS(app)  # Habilitar CORS para todas las rutas
+CORS(app, expose_headers=['ETag', 'X-Item-ETags', 'X-Total-Count'])  # Habilitar CORS para todas las rutas
+
+# ==================== SERIALIZACIÓN JSON ====================
+
+# Codificador JSON: 'auto' (orjson, luego ujson, luego stdlib), 'orjson', 'ujson' o 'stdlib'
+JSON_BACKEND = os.environ.get('JSON_BACKEND', 'auto')
+
+def select_json_backend(name):
+    """Elige el codificador JSON disponible según la configuración"""
+    available = {'orjson': orjson is not None, 'ujson': ujson is not None, 'stdlib': True}
+    if name == 'auto':
+        return next(backend for backend in ('orjson', 'ujson', 'stdlib') if available[backend])
+    if name not in available:
+        raise ValueError(f'JSON_BACKEND desconocido: {name}')
+    if not available[name]:
+        app.logger.warning('JSON_BACKEND=%s no está instalado, se usará stdlib', name)
+        return 'stdlib'
+    return name
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Proveedor JSON que usa orjson o ujson si están instalados
+    
+    Codifica sqlite3.Row directamente, sin copias intermedias a dict en los
+    handlers. Con el backend stdlib la salida es idéntica a la de Flask; con
+    orjson y ujson el contenido es el mismo salvo que los caracteres no ASCII
+    no se escapan y orjson codifica NaN e Infinity como null (stdlib escribe
+    NaN/Infinity, que no es JSON válido). tests/test_json_provider.py lo verifica.
+    """
+    
+    def __init__(self, app, backend='stdlib'):
+        super().__init__(app)
+        self.backend = backend
+    
+    @staticmethod
+    def default(o):
+        if isinstance(o, sqlite3.Row):
+            return dict(o)
+        return DefaultJSONProvider.default(o)
+    
+    def dumps_fast(self, obj):
+        """Codifica en formato compacto con el backend rápido; devuelve bytes"""
+        try:
+            if self.backend == 'orjson':
+                return orjson.dumps(
+                    obj,
+                    default=self.default,
+                    option=(orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+                            | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS)
+                )
+            if self.backend == 'ujson':
+                return ujson.dumps(
+                    obj,
+                    default=self.default,
+                    sort_keys=True,
+                    ensure_ascii=False,
+                    escape_forward_slashes=False
+                ).encode('utf-8')
+        except (TypeError, OverflowError, ValueError):
+            # Tipos o valores que el backend rápido no admite
+            pass
+        return self.dumps(obj, separators=(',', ':')).encode('utf-8')
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        if self.backend == 'stdlib' or (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(obj)
+        return self._app.response_class(self.dumps_fast(obj) + b'\n', mimetype=self.mimetype)
+
+app.json = FastJSONProvider(app, select_json_backend(JSON_BACKEND))
 
 DATABASE = 'comunicados.db'
 
-def get_db_connection():
-    """Establece conexión con la base de datos SQLite"""
-    conn = sqlite3.connect(DATABASE)
+# Umbral (en milisegundos) a partir del cual una consulta se registra como lenta
+SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', 100))
+
+slow_query_logger = logging.getLogger('consultas_lentas')
+if os.environ.get('SLOW_QUERY_LOG'):
+    slow_query_logger.addHandler(logging.FileHandler(os.environ['SLOW_QUERY_LOG']))
+    slow_query_logger.setLevel(logging.WARNING)
+
+# Estadísticas de consultas lentas agrupadas por forma de la consulta
+slow_query_stats = {}
+slow_query_lock = threading.Lock()
+
+def normalize_query(sql):
+    """Obtiene la forma de una consulta: sin literales y con espacios compactados"""
+    shape = re.sub(r"'(?:[^']|'')*'", '?', sql)
+    shape = re.sub(r'\b\d+\b', '?', shape)
+    return ' '.join(shape.split())
+
+def redact_parameters(parameters):
+    """Oculta los valores de los parámetros, conservando solo su tipo y longitud"""
+    if isinstance(parameters, dict):
+        return {k: redact_parameters([v])[0] for k, v in parameters.items()}
+    redacted = []
+    for value in parameters:
+        if value is None:
+            redacted.append(None)
+        elif isinstance(value, (str, bytes)):
+            redacted.append(f'<{type(value).__name__}:{len(value)}>')
+        else:
+            redacted.append(f'<{type(value).__name__}>')
+    return redacted
+
+def record_slow_query(conn, sql, parameters, elapsed_ms, rows):
+    """Registra una consulta lenta con su plan de ejecución y la agrega a las estadísticas"""
+    try:
+        plan = [
+            row[-1] for row in
+            sqlite3.Cursor(conn).execute('EXPLAIN QUERY PLAN ' + sql, parameters).fetchall()
+        ]
+    except sqlite3.Error as e:
+        plan = [f'No disponible: {e}']
+    
+    shape = normalize_query(sql)
+    entry = {
+        'query': shape,
+        'duration_ms': round(elapsed_ms, 3),
+        'rows': rows,
+        'plan': plan,
+        'endpoint': request.endpoint if has_request_context() else None,
+        'parameters': redact_parameters(parameters)
+    }
+    slow_query_logger.warning(json.dumps(entry, ensure_ascii=False))
+    
+    with slow_query_lock:
+        stats = slow_query_stats.setdefault(shape, {
+            'query': shape,
+            'count': 0,
+            'total_ms': 0.0,
+            'max_ms': 0.0
+        })
+        stats['count'] += 1
+        stats['total_ms'] += elapsed_ms
+        if elapsed_ms >= stats['max_ms']:
+            stats['max_ms'] = elapsed_ms
+            stats['plan'] = plan
+            stats['endpoint'] = entry['endpoint']
+
+# Presupuesto de tiempo (en ms) de las consultas de cada petición; 0 lo desactiva.
+# QUERY_DEADLINES ajusta el presupuesto por endpoint: 'get_comunicados=2000,create_blog=3000'
+QUERY_DEADLINE_MS = float(os.environ.get('QUERY_DEADLINE_MS', 5000))
+
+def parse_route_deadlines(spec):
+    """Interpreta QUERY_DEADLINES como un diccionario endpoint -> milisegundos"""
+    deadlines = {}
+    for item in (spec or '').split(','):
+        if item.strip():
+            endpoint, _, ms = item.partition('=')
+            deadlines[endpoint.strip()] = float(ms)
+    return deadlines
+
+QUERY_DEADLINES = parse_route_deadlines(os.environ.get('QUERY_DEADLINES'))
+
+# Consultas abortadas por agotar el presupuesto, desde el arranque
+query_deadline_stats = {'interrupted': 0, 'lock_timeout': 0}
+query_deadline_lock = threading.Lock()
+
+class QueryDeadlineExceeded(Exception):
+    """La petición agotó su presupuesto de tiempo de base de datos"""
+    
+    def __init__(self, reason):
+        super().__init__(reason)
+        self.reason = reason
+
+def query_deadline():
+    """Instante límite (time.monotonic) para las consultas de la petición actual, o None"""
+    if has_request_context():
+        return g.get('query_deadline')
+    return None
+
+def check_query_deadline(conn, error):
+    """Si el error se debe al presupuesto de la petición, revierte y lo registra en g"""
+    if query_deadline() is None or getattr(conn, 'write_committed', False):
+        return
+    message = str(error)
+    if message == 'interrupted':
+        reason = 'interrupted'
+    elif 'locked' in message or 'busy' in message:
+        reason = 'lock_timeout'
+    else:
+        return
+    
+    conn.rollback()
+    g.query_aborted = reason
+    with query_deadline_lock:
+        query_deadline_stats[reason] += 1
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor que mide la duración de cada sentencia y registra las lentas"""
+    
+    def execute(self, sql, parameters=()):
+        self._sql = sql
+        self._parameters = parameters
+        self._rows = 0
+        self._reported = False
+        start = time.perf_counter()
+        try:
+            super().execute(sql, parameters)
+        except sqlite3.OperationalError as e:
+            check_query_deadline(self.connection, e)
+            raise
+        self._elapsed_ms = (time.perf_counter() - start) * 1000
+        # Las sentencias sin resultado (INSERT, UPDATE, DELETE...) se evalúan de inmediato
+        if self.description is None:
+            self._report(self.rowcount)
+        return self
+    
+    def fetchone(self):
+        start = time.perf_counter()
+        try:
+            row = super().fetchone()
+        except sqlite3.OperationalError as e:
+            check_query_deadline(self.connection, e)
+            raise
+        self._elapsed_ms += (time.perf_counter() - start) * 1000
+        self._report(0 if row is None else 1)
+        return row
+    
+    def fetchall(self):
+        start = time.perf_counter()
+        try:
+            rows = super().fetchall()
+        except sqlite3.OperationalError as e:
+            check_query_deadline(self.connection, e)
+            raise
+        self._elapsed_ms += (time.perf_counter() - start) * 1000
+        self._report(len(rows))
+        return rows
+    
+    def _report(self, rows):
+        # Varias llamadas a fetchone suman filas y tiempo, pero cada sentencia se registra una sola vez
+        self._rows += rows
+        if not self._reported and self._elapsed_ms >= SLOW_QUERY_MS:
+            self._reported = True
+            record_slow_query(self.connection, self._sql, self._parameters, self._elapsed_ms, self._rows)
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Conexión SQLite cuyas consultas pasan por InstrumentedCursor"""
+    
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+    
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+    
+    def commit(self):
+        wrote = self.in_transaction
+        try:
+            super().commit()
+        except sqlite3.OperationalError as e:
+            check_query_deadline(self, e)
+            raise
+        if wrote and query_deadline() is not None:
+            # La escritura ya está guardada: las lecturas posteriores (p. ej. devolver la fila
+            # creada) no deben convertirla en un 504/503, así que salen del presupuesto
+            self.write_committed = True
+            self.set_progress_handler(None, 0)
+            super().execute('PRAGMA busy_timeout = 5000')
+
+def get_db_connection(*tables):
+    """Establece conexión con la base de datos SQLite
+    
+    En la disposición por secciones se conecta al archivo de la primera tabla
+    y adjunta (ATTACH) los archivos de las demás, de modo que las consultas
+    entre secciones funcionan sin cambios. Sin tablas se adjuntan todos.
+    
+    Dentro de una petición, las consultas se interrumpen al agotar su
+    presupuesto de tiempo (QUERY_DEADLINE_MS).
+    """
+    paths = []
+    for path in ([database_for(t) for t in tables] if tables else database_files()):
+        if path not in paths:
+            paths.append(path)
+    
+    deadline = query_deadline()
+    if deadline is None:
+        conn = sqlite3.connect(paths[0], factory=InstrumentedConnection)
+    else:
+        # La espera por bloqueos (busy_timeout) y la ejecución quedan acotadas por el presupuesto
+        conn = sqlite3.connect(
+            paths[0],
+            timeout=max(deadline - time.monotonic(), 0),
+            factory=InstrumentedConnection
+        )
+        conn.set_progress_handler(lambda: time.monotonic() > deadline, 1000)
     conn.row_factory = sqlite3.Row
+    for i, path in enumerate(paths[1:], start=1):
+        conn.execute(f'ATTACH DATABASE ? AS shard{i}', (path,))
     return conn
 
-def init_db():
-    """Inicializa la base de datos con todas las tablas necesarias"""
-    conn = get_db_connection()
+# ==================== ALMACENAMIENTO ====================
+
+TABLES = ['comunicados', 'blog', 'comentarios', 'deportes', 'horarios']
+
+# Disposición del almacenamiento: 'single' (todo en DATABASE) o 'sharded'
+# (cada grupo de secciones en su propio archivo, con su propio WAL)
+DB_LAYOUT = os.environ.get('DB_LAYOUT', 'single')
+DB_SHARD_DIR = os.environ.get('DB_SHARD_DIR', 'shards')
+
+def parse_shard_groups(spec):
+    """Agrupa las secciones por archivo a partir de DB_SHARDS
+    
+    Formato: 'comunicados,blog;comentarios'. Las secciones no mencionadas
+    van cada una en su propio archivo.
+    """
+    groups = []
+    assigned = set()
+    for group in (spec or '').split(';'):
+        tables = [t.strip() for t in group.split(',') if t.strip()]
+        if not tables:
+            continue
+        unknown = [t for t in tables if t not in TABLES or t in assigned]
+        if unknown:
+            raise ValueError(f'DB_SHARDS contiene secciones desconocidas o repetidas: {unknown}')
+        groups.append(tables)
+        assigned.update(tables)
     
-    # Tabla comunicados
-    conn.execute('''
+    for table in TABLES:
+        if table not in assigned:
+            groups.append([table])
+    return groups
+
+# Secciones con nivel de archivo: las filas antiguas pasan a <tabla>_archivo
+ARCHIVED_TABLES = ['comunicados', 'comentarios']
+ARCHIVE_TABLES = {f'{table}_archivo': table for table in ARCHIVED_TABLES}
+
+SHARD_GROUPS = parse_shard_groups(os.environ.get('DB_SHARDS'))
+SHARD_FILES = {
+    table: os.path.join(DB_SHARD_DIR, '_'.join(group) + '.db')
+    for group in SHARD_GROUPS
+    for table in group
+}
+
+def database_for(table):
+    """Devuelve el archivo de base de datos donde vive una tabla"""
+    if DB_LAYOUT != 'sharded':
+        return DATABASE
+    # Las tablas de archivo viven junto a su tabla principal
+    return SHARD_FILES[ARCHIVE_TABLES.get(table, table)]
+
+def database_files():
+    """Devuelve todos los archivos de base de datos de la disposición actual"""
+    files = []
+    for table in TABLES:
+        path = database_for(table)
+        if path not in files:
+            files.append(path)
+    return files
+
+SCHEMAS = {
+    'comunicados': '''
         CREATE TABLE IF NOT EXISTS comunicados (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             titulo TEXT NOT NULL,
@@ -30,10 +396,8 @@ def init_db():
             fecha TEXT NOT NULL,
             created_at TEXT NOT NULL
         )
-    ''')
-    
-    # Tabla blog
-    conn.execute('''
+    ''',
+    'blog': '''
         CREATE TABLE IF NOT EXISTS blog (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             titulo TEXT NOT NULL,
@@ -43,10 +407,8 @@ def init_db():
             fecha TEXT NOT NULL,
             created_at TEXT NOT NULL
         )
-    ''')
-    
-    # Tabla comentarios
-    conn.execute('''
+    ''',
+    'comentarios': '''
         CREATE TABLE IF NOT EXISTS comentarios (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             titulo TEXT NOT NULL,
@@ -55,10 +417,8 @@ def init_db():
             fecha TEXT NOT NULL,
             created_at TEXT NOT NULL
         )
-    ''')
-    
-    # Tabla deportes
-    conn.execute('''
+    ''',
+    'deportes': '''
         CREATE TABLE IF NOT EXISTS deportes (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             titulo TEXT NOT NULL,
@@ -67,9 +427,8 @@ def init_db():
             fecha TEXT NOT NULL,
             created_at TEXT NOT NULL
         )
-    ''')
-    # Tabla horarios
-    conn.execute('''
+    ''',
+    'horarios': '''
         CREATE TABLE IF NOT EXISTS horarios (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             titulo TEXT NOT NULL,
@@ -77,11 +436,161 @@ def init_db():
             fecha TEXT NOT NULL,
             created_at TEXT NOT NULL
         )
+    ''',
+    'comunicados_archivo': '''
+        CREATE TABLE IF NOT EXISTS comunicados_archivo (
+            id INTEGER PRIMARY KEY,
+            titulo TEXT NOT NULL,
+            contenido TEXT NOT NULL,
+            imagen TEXT,
+            fecha TEXT NOT NULL,
+            created_at TEXT NOT NULL
+        )
+    ''',
+    'comentarios_archivo': '''
+        CREATE TABLE IF NOT EXISTS comentarios_archivo (
+            id INTEGER PRIMARY KEY,
+            titulo TEXT NOT NULL,
+            contenido TEXT NOT NULL,
+            imagen TEXT,
+            fecha TEXT NOT NULL,
+            created_at TEXT NOT NULL
+        )
+    '''
+}
+
+COUNTERS_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS contadores (
+        clave TEXT PRIMARY KEY,
+        total INTEGER NOT NULL
+    )
+'''
+
+def counter_triggers(table):
+    """Sentencias de los triggers que mantienen los totales de una tabla en contadores"""
+    increment = '''
+        INSERT INTO contadores (clave, total) VALUES ({key}, 1)
+        ON CONFLICT (clave) DO UPDATE SET total = total + 1;
+    '''
+    decrement = '''
+        UPDATE contadores SET total = total - 1 WHERE clave = {key};
+    '''
+    insert_body = increment.format(key=f"'{table}'")
+    delete_body = decrement.format(key=f"'{table}'")
+    triggers = []
+    
+    if table == 'blog':
+        # Totales por categoría con clave 'blog:<categoria>'
+        insert_body += increment.format(key="'blog:' || NEW.categoria")
+        delete_body += decrement.format(key="'blog:' || OLD.categoria")
+        triggers.append(f'''
+            CREATE TRIGGER IF NOT EXISTS blog_contador_categoria
+            AFTER UPDATE OF categoria ON blog
+            WHEN OLD.categoria IS NOT NEW.categoria
+            BEGIN
+                {decrement.format(key="'blog:' || OLD.categoria")}
+                {increment.format(key="'blog:' || NEW.categoria")}
+            END
+        ''')
+    
+    triggers.append(f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_contador_insert
+        AFTER INSERT ON {table}
+        BEGIN
+            {insert_body}
+        END
     ''')
+    triggers.append(f'''
+        CREATE TRIGGER IF NOT EXISTS {table}_contador_delete
+        AFTER DELETE ON {table}
+        BEGIN
+            {delete_body}
+        END
+    ''')
+    return triggers
+
+def init_counters(conn, table):
+    """Crea los triggers de contadores de una tabla; los totales iniciales se calculan una sola vez"""
+    conn.execute('BEGIN IMMEDIATE')
+    conn.execute(COUNTERS_SCHEMA)
+    initialized = conn.execute('SELECT 1 FROM contadores WHERE clave = ?', (table,)).fetchone()
+    for trigger in counter_triggers(table):
+        conn.execute(trigger)
+    
+    if not initialized:
+        conn.execute(
+            f'INSERT INTO contadores (clave, total) SELECT ?, COUNT(*) FROM {table}', (table,)
+        )
+        if table == 'blog':
+            conn.execute('''
+                INSERT OR REPLACE INTO contadores (clave, total)
+                SELECT 'blog:' || categoria, COUNT(*) FROM blog GROUP BY categoria
+            ''')
+    conn.commit()
+
+def get_total(conn, key):
+    """Lee un total de la tabla contadores en tiempo constante"""
+    row = conn.execute('SELECT total FROM contadores WHERE clave = ?', (key,)).fetchone()
+    return row['total'] if row else 0
+
+GENERATIONS_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS generaciones (
+        seccion TEXT PRIMARY KEY,
+        valor INTEGER NOT NULL
+    )
+'''
+
+def init_generation(conn, section):
+    """Crea los triggers que incrementan la generación de una sección con cada escritura"""
+    conn.execute('BEGIN IMMEDIATE')
+    conn.execute(GENERATIONS_SCHEMA)
+    # Se parte de la hora actual en ms para no repetir generaciones si la base se reemplaza
+    conn.execute(
+        'INSERT OR IGNORE INTO generaciones (seccion, valor) VALUES (?, ?)',
+        (section, int(time.time() * 1000))
+    )
+    tables = [section] + [archive for archive, table in ARCHIVE_TABLES.items() if table == section]
+    for table in tables:
+        for event in ('INSERT', 'UPDATE', 'DELETE'):
+            conn.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {table}_generacion_{event.lower()}
+                AFTER {event} ON {table}
+                BEGIN
+                    UPDATE generaciones SET valor = valor + 1 WHERE seccion = '{section}';
+                END
+            ''')
+    conn.commit()
+
+def get_generation(conn, section):
+    """Lee la generación actual de una sección"""
+    row = conn.execute('SELECT valor FROM generaciones WHERE seccion = ?', (section,)).fetchone()
+    return row['valor'] if row else 0
+
+def init_db():
+    """Inicializa la base de datos con todas las tablas necesarias"""
+    if DB_LAYOUT == 'sharded':
+        os.makedirs(DB_SHARD_DIR, exist_ok=True)
+    
+    for path in database_files():
+        conn = sqlite3.connect(path)
+        # Solo tiene efecto en bases nuevas; las existentes las convierte `flask maintenance`
+        conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+        if DB_LAYOUT == 'sharded':
+            conn.execute('PRAGMA journal_mode = WAL')
+        conn.close()
     
     # Insertar datos de ejemplo si las tablas están vacías
-    for table in ['comunicados', 'blog', 'comentarios', 'deportes', 'horarios']:
-        count = conn.execute(f'SELECT COUNT(*) as count FROM {table}').fetchone()['count']
+    for table in TABLES:
+        conn = get_db_connection(table)
+        conn.execute(SCHEMAS[table])
+        init_counters(conn, table)
+        count = get_total(conn, table)
+        if table in ARCHIVED_TABLES:
+            conn.execute(SCHEMAS[f'{table}_archivo'])
+            init_counters(conn, f'{table}_archivo')
+            # Una tabla vaciada por el archivado no debe recibir de nuevo los datos de ejemplo
+            count += get_total(conn, f'{table}_archivo')
+        init_generation(conn, table)
         if count == 0:
             if table == 'comunicados':
                 conn.execute('''
@@ -200,12 +709,545 @@ def init_db():
                     '2025-01-01',
                     datetime.utcnow().isoformat() + 'Z'
                 ))
+        
+        conn.commit()
+        conn.close()
+
+# Inicializar DB al arrancar. `flask split-db` se omite: se ejecuta normalmente con
+# DB_LAYOUT=sharded y crear aquí los archivos destino le impediría migrar.
+if 'split-db' not in sys.argv[1:]:
+    init_db()
+
+@app.cli.command('split-db')
+@click.option('--source', default=DATABASE, show_default=True, help='Base de datos única a dividir')
+def split_db_command(source):
+    """Divide la base de datos única en un archivo por grupo de secciones (DB_SHARDS)
     
-    conn.commit()
+    Puede ejecutarse con cualquier DB_LAYOUT; los archivos destino no deben
+    existir. Al arrancar con DB_LAYOUT=sharded se crean los contadores y triggers.
+    """
+    targets = {
+        os.path.join(DB_SHARD_DIR, '_'.join(group) + '.db'): group
+        for group in SHARD_GROUPS
+    }
+    existing = [path for path in targets if os.path.exists(path)]
+    if existing:
+        raise click.ClickException(f'Los archivos destino ya existen: {", ".join(existing)}')
+    
+    os.makedirs(DB_SHARD_DIR, exist_ok=True)
+    for path, group in targets.items():
+        conn = sqlite3.connect(path)
+        conn.execute('PRAGMA journal_mode = WAL')
+        conn.execute('ATTACH DATABASE ? AS origen', (source,))
+        archives = [archive for archive, table in ARCHIVE_TABLES.items() if table in group]
+        for table in group + archives:
+            # Tablas e índices con su definición original
+            definitions = conn.execute(
+                """SELECT sql FROM origen.sqlite_master
+                   WHERE tbl_name = ? AND type IN ('table', 'index') AND sql IS NOT NULL
+                   ORDER BY type = 'index'""",
+                (table,)
+            ).fetchall()
+            if not definitions:
+                continue
+            for (sql,) in definitions:
+                conn.execute(sql)
+            conn.execute(f'INSERT INTO main.{table} SELECT * FROM origen.{table}')
+            # Conservar el contador AUTOINCREMENT para no reutilizar ids
+            conn.execute('DELETE FROM main.sqlite_sequence WHERE name = ?', (table,))
+            conn.execute(
+                '''INSERT INTO main.sqlite_sequence (name, seq)
+                   SELECT name, seq FROM origen.sqlite_sequence WHERE name = ?''',
+                (table,)
+            )
+        conn.commit()
+        conn.execute('DETACH DATABASE origen')
+        conn.close()
+        click.echo(f'{path}: {", ".join(group)}')
+
+# ==================== ARCHIVO Y MANTENIMIENTO ====================
+
+# Antigüedad (en días) a partir de la cual una fila pasa al archivo; 0 lo desactiva
+ARCHIVE_AFTER_DAYS = int(os.environ.get('ARCHIVE_AFTER_DAYS', 365))
+ARCHIVE_BATCH_SIZE = int(os.environ.get('ARCHIVE_BATCH_SIZE', 500))
+# Intervalo (en segundos) entre mantenimientos en segundo plano; 0 lo desactiva
+MAINTENANCE_INTERVAL = float(os.environ.get('MAINTENANCE_INTERVAL', 3600))
+# Páginas libres que devuelve cada VACUUM incremental
+VACUUM_PAGES = int(os.environ.get('VACUUM_PAGES', 1000))
+MAINTENANCE_LOCK = DATABASE + '.mantenimiento.lock'
+# Archivo separado del bloqueo: su fecha de modificación marca el último mantenimiento completado
+MAINTENANCE_STAMP = DATABASE + '.mantenimiento'
+
+def archive_old_rows():
+    """Mueve por lotes a las tablas de archivo las filas con fecha anterior al corte"""
+    cutoff = (datetime.utcnow() - timedelta(days=ARCHIVE_AFTER_DAYS)).strftime('%Y-%m-%d')
+    moved = {}
+    for table in ARCHIVED_TABLES:
+        moved[table] = 0
+        conn = get_db_connection(table)
+        while True:
+            ids = [row['id'] for row in conn.execute(
+                f'SELECT id FROM {table} WHERE fecha < ? ORDER BY id LIMIT ?',
+                (cutoff, ARCHIVE_BATCH_SIZE)
+            ).fetchall()]
+            if not ids:
+                break
+            
+            # Cada lote en su propia transacción para no retener el bloqueo de escritura
+            placeholders = ', '.join('?' * len(ids))
+            conn.execute(
+                f'INSERT INTO {table}_archivo SELECT * FROM {table} WHERE id IN ({placeholders})', ids
+            )
+            conn.execute(f'DELETE FROM {table} WHERE id IN ({placeholders})', ids)
+            conn.commit()
+            moved[table] += len(ids)
+        conn.close()
+    return moved
+
+def restore_archived_row(conn, table, id):
+    """Devuelve una fila archivada a su tabla para que pueda modificarse o eliminarse
+    
+    El movimiento queda en la transacción de la escritura que lo sigue; si esta no
+    se confirma, la fila permanece en el archivo.
+    """
+    if table in ARCHIVED_TABLES and conn.execute(
+        f'SELECT 1 FROM {table}_archivo WHERE id = ?', (id,)
+    ).fetchone():
+        conn.execute(f'INSERT INTO {table} SELECT * FROM {table}_archivo WHERE id = ?', (id,))
+        conn.execute(f'DELETE FROM {table}_archivo WHERE id = ?', (id,))
+
+def optimize_database(path, convert=False):
+    """Ejecuta VACUUM incremental, PRAGMA optimize y un checkpoint del WAL sobre un archivo
+    
+    Una base creada antes del modo incremental solo se convierte con convert=True
+    (`flask maintenance`): el VACUUM completo bloquea la base mientras dura, así
+    que el hilo en segundo plano nunca lo ejecuta y en esas bases se limita a
+    PRAGMA optimize. La disposición single no usa WAL (solo la sharded lo activa),
+    por lo que ahí el checkpoint se omite.
+    """
+    conn = sqlite3.connect(path, isolation_level=None)
+    incremental = conn.execute('PRAGMA auto_vacuum').fetchone()[0] == 2
+    if not incremental and convert:
+        conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+        conn.execute('VACUUM')
+        incremental = True
+    if incremental:
+        conn.execute(f'PRAGMA incremental_vacuum({VACUUM_PAGES})').fetchall()
+    conn.execute('PRAGMA optimize')
+    if conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal':
+        conn.execute('PRAGMA wal_checkpoint(TRUNCATE)').fetchall()
     conn.close()
 
-# Inicializar DB al arrancar
-init_db()
+def run_maintenance(convert=False):
+    """Archiva filas antiguas y optimiza todos los archivos de base de datos"""
+    archived = archive_old_rows() if ARCHIVE_AFTER_DAYS > 0 else {}
+    for path in database_files():
+        optimize_database(path, convert)
+    return archived
+
+def maintenance_due():
+    """Indica si pasó el intervalo desde el último mantenimiento de cualquier worker"""
+    try:
+        return time.time() - os.path.getmtime(MAINTENANCE_STAMP) >= MAINTENANCE_INTERVAL
+    except OSError:
+        return True
+
+def maintenance_loop():
+    """Ejecuta el mantenimiento periódicamente, fuera del camino de las peticiones"""
+    while True:
+        time.sleep(MAINTENANCE_INTERVAL)
+        if not maintenance_due():
+            continue
+        try:
+            with open(MAINTENANCE_LOCK, 'a') as lock:
+                # Solo un worker a la vez; los demás omiten esta ronda
+                if fcntl:
+                    try:
+                        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    except OSError:
+                        continue
+                if maintenance_due():
+                    archived = run_maintenance()
+                    # Abrir el bloqueo no altera la marca; solo se actualiza al terminar
+                    with open(MAINTENANCE_STAMP, 'a'):
+                        os.utime(MAINTENANCE_STAMP)
+                    app.logger.info('Mantenimiento completado, filas archivadas: %s', archived)
+        except Exception:
+            app.logger.exception('Error en el mantenimiento de la base de datos')
+
+maintenance_pid = None
+
+@app.before_request
+def start_maintenance():
+    """Inicia el hilo de mantenimiento en cada proceso (también tras el fork de gunicorn)"""
+    global maintenance_pid
+    if MAINTENANCE_INTERVAL > 0 and maintenance_pid != os.getpid():
+        maintenance_pid = os.getpid()
+        threading.Thread(target=maintenance_loop, name='mantenimiento', daemon=True).start()
+
+@app.cli.command('maintenance')
+def maintenance_command():
+    """Ejecuta una vez el archivado y la optimización de la base de datos
+    
+    A diferencia del mantenimiento en segundo plano, convierte al modo de VACUUM
+    incremental las bases creadas antes de él (VACUUM completo, bloquea la base).
+    """
+    archived = run_maintenance(convert=True)
+    for table, count in archived.items():
+        click.echo(f'{table}: {count} filas archivadas')
+    click.echo('Optimización completada')
+
+# ==================== CAPTURA DE TRÁFICO ====================
+
+# Archivo JSONL donde se guardan las peticiones muestreadas; sin definir, la captura está desactivada
+CAPTURE_FILE = os.environ.get('CAPTURE_FILE')
+CAPTURE_SAMPLE_RATE = float(os.environ.get('CAPTURE_SAMPLE_RATE', 1.0))
+CAPTURE_FLUSH_INTERVAL = float(os.environ.get('CAPTURE_FLUSH_INTERVAL', 1.0))
+CAPTURE_BUFFER_SIZE = int(os.environ.get('CAPTURE_BUFFER_SIZE', 1000))
+
+class TrafficRecorder:
+    """Acumula registros de peticiones en memoria y los escribe como JSONL desde un hilo"""
+    
+    def __init__(self, path, flush_interval, buffer_size):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.buffer_size = buffer_size
+        self.dropped = 0
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._pid = None
+    
+    def record(self, entry):
+        with self._lock:
+            # Bajo el bloqueo: solo el primer hilo del proceso inicia la escritura
+            if self._pid != os.getpid():
+                self._start()
+            # Si la escritura no da abasto se descartan registros en vez de crecer sin límite
+            if len(self._buffer) >= self.buffer_size * 10:
+                self.dropped += 1
+                return
+            self._buffer.append(entry)
+            full = len(self._buffer) >= self.buffer_size
+        if full:
+            self._wakeup.set()
+    
+    def flush(self):
+        with self._lock:
+            entries, self._buffer = self._buffer, []
+        if entries:
+            data = ''.join(json.dumps(e, ensure_ascii=False) + '\n' for e in entries)
+            # Una sola escritura en modo append por lote, segura entre workers
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(data)
+    
+    def _start(self):
+        # Un hilo por proceso: los hilos no sobreviven al fork de gunicorn. Se llama con _lock tomado
+        self._pid = os.getpid()
+        self._buffer = []
+        threading.Thread(target=self._run, name='captura', daemon=True).start()
+        atexit.register(self.flush)
+    
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                app.logger.exception('Error al escribir la captura de tráfico')
+
+traffic_recorder = (
+    TrafficRecorder(CAPTURE_FILE, CAPTURE_FLUSH_INTERVAL, CAPTURE_BUFFER_SIZE)
+    if CAPTURE_FILE else None
+)
+
+@app.before_request
+def start_capture():
+    """Decide si la petición se captura y toma el instante de inicio"""
+    if traffic_recorder and random.random() < CAPTURE_SAMPLE_RATE:
+        g.capture_start = time.perf_counter()
+
+@app.after_request
+def capture_request(response):
+    """Registra la petición muestreada con su duración, estado y tamaño de respuesta"""
+    if 'capture_start' in g:
+        duration = time.perf_counter() - g.capture_start
+        traffic_recorder.record({
+            # Instante de llegada, usado por replay.py para respetar el ritmo original
+            'ts': round(time.time() - duration, 6),
+            'method': request.method,
+            'path': request.path,
+            'query': request.query_string.decode('latin-1'),
+            'body': request.get_data(as_text=True) or None,
+            'content_type': request.content_type,
+            'duration_ms': round(duration * 1000, 3),
+            'status': response.status_code,
+            'size': response.calculate_content_length()
+        })
+    return response
+
+# ==================== LÍMITES DE TIEMPO ====================
+
+@app.before_request
+def set_query_deadline():
+    """Fija el instante límite de las consultas según el presupuesto del endpoint"""
+    budget = QUERY_DEADLINES.get(request.endpoint, QUERY_DEADLINE_MS)
+    if budget > 0:
+        g.query_deadline_ms = budget
+        g.query_deadline = time.monotonic() + budget / 1000
+
+def query_deadline_response(reason):
+    """Respuesta estructurada para una petición que agotó su presupuesto"""
+    if reason == 'interrupted':
+        response = jsonify({
+            'error': 'La consulta superó el tiempo máximo permitido',
+            'reason': reason,
+            'deadline_ms': g.get('query_deadline_ms')
+        })
+        response.status_code = 504
+    else:
+        response = jsonify({
+            'error': 'La base de datos está ocupada, intente nuevamente',
+            'reason': reason,
+            'deadline_ms': g.get('query_deadline_ms')
+        })
+        response.status_code = 503
+        response.headers['Retry-After'] = '1'
+    return response
+
+@app.after_request
+def enforce_query_deadline(response):
+    """Reemplaza la respuesta del handler si alguna consulta se abortó por el presupuesto"""
+    reason = g.get('query_aborted')
+    if reason is None:
+        return response
+    return query_deadline_response(reason)
+
+# ==================== CACHÉ DE ELEMENTOS ====================
+
+SECTIONS = {
+    'horarios': {
+        'not_found': 'Horario no encontrado',
+        'fields': ['titulo', 'imagen', 'fecha'],
+        'required': ['titulo', 'fecha']
+    },
+    'comunicados': {
+        'not_found': 'Comunicado no encontrado',
+        'fields': ['titulo', 'contenido', 'imagen', 'fecha'],
+        'required': ['titulo', 'contenido', 'fecha']
+    },
+    'blog': {
+        'not_found': 'Entrada de blog no encontrada',
+        'fields': ['titulo', 'contenido', 'categoria', 'imagen', 'fecha'],
+        'required': ['titulo', 'contenido', 'categoria', 'fecha']
+    },
+    'comentarios': {
+        'not_found': 'Comentario no encontrado',
+        'fields': ['titulo', 'contenido', 'imagen', 'fecha'],
+        'required': ['titulo', 'contenido', 'fecha']
+    },
+    'deportes': {
+        'not_found': 'Actividad deportiva no encontrada',
+        'fields': ['titulo', 'contenido', 'imagen', 'fecha'],
+        'required': ['titulo', 'contenido', 'fecha']
+    }
+}
+
+# Tamaño máximo de la caché de elementos y vigencia (en segundos) de cada entrada.
+# Cada entrada guarda la generación de su sección (tabla generaciones, mantenida por
+# triggers) y solo se usa mientras esta no cambie, de modo que una escritura hecha en
+# cualquier worker invalida la caché de todos. La vigencia solo limita la memoria.
+ITEM_CACHE_SIZE = int(os.environ.get('ITEM_CACHE_SIZE', 1024))
+ITEM_CACHE_TTL = float(os.environ.get('ITEM_CACHE_TTL', 5))
+MULTI_GET_MAX_IDS = 100
+
+class ItemCache:
+    """Caché LRU de elementos individuales indexada por (tabla, id) y validada por generación"""
+    
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, table, id, generation):
+        key = (table, id)
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None:
+                return None
+            item, etag, stored_generation, stored_at = entry
+            if stored_generation != generation or time.monotonic() - stored_at > self.ttl:
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return item, etag
+    
+    def put(self, table, id, item, etag, generation):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._items[(table, id)] = (item, etag, generation, time.monotonic())
+            self._items.move_to_end((table, id))
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+    
+    def invalidate(self, table, id):
+        with self._lock:
+            self._items.pop((table, id), None)
+
+item_cache = ItemCache(ITEM_CACHE_SIZE, ITEM_CACHE_TTL)
+
+def item_etag(item):
+    """Calcula el ETag de un elemento a partir de su contenido"""
+    return hashlib.sha1(json.dumps(item, sort_keys=True).encode('utf-8')).hexdigest()
+
+def fetch_items(table, ids):
+    """Obtiene elementos por id desde la caché, resolviendo los que falten con una sola consulta IN (...)
+    
+    Siempre se lee la generación de la sección (una búsqueda por clave primaria)
+    para descartar entradas anteriores a la última escritura de cualquier worker.
+    """
+    conn = get_db_connection(table)
+    try:
+        # La generación se lee antes que las filas: si hay una escritura en medio,
+        # lo guardado queda con una generación vieja y se descarta en la próxima lectura
+        generation = get_generation(conn, table)
+        found = {}
+        missing = []
+        for id in ids:
+            cached = item_cache.get(table, id, generation)
+            if cached:
+                found[id] = cached
+            else:
+                missing.append(id)
+        
+        if missing:
+            placeholders = ', '.join('?' * len(missing))
+            query = f'SELECT * FROM {table} WHERE id IN ({placeholders})'
+            parameters = list(missing)
+            if table in ARCHIVED_TABLES:
+                query += f' UNION ALL SELECT * FROM {table}_archivo WHERE id IN ({placeholders})'
+                parameters += missing
+            rows = conn.execute(query, parameters).fetchall()
+            
+            for row in rows:
+                item = dict(row)
+                etag = item_etag(item)
+                item_cache.put(table, item['id'], item, etag, generation)
+                found[item['id']] = (item, etag)
+    finally:
+        conn.close()
+    
+    return found
+
+def get_item_response(table, id):
+    """Respuesta para GET /api/<sección>/<id>, con ETag y soporte de If-None-Match"""
+    found = fetch_items(table, [id]).get(id)
+    if not found:
+        return jsonify({'error': SECTIONS[table]['not_found']}), 404
+    
+    item, etag = found
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        response = jsonify(item)
+    response.set_etag(etag)
+    return response
+
+def get_items_response(table, ids_param):
+    """Respuesta para GET /api/<sección>?ids=1,5,9, en el orden pedido y con un ETag por elemento"""
+    try:
+        ids = list(dict.fromkeys(int(i) for i in ids_param.split(',') if i.strip()))
+    except ValueError:
+        return jsonify({'error': 'El parámetro "ids" debe ser una lista de enteros separados por comas'}), 400
+    
+    if not ids:
+        return jsonify({'error': 'El parámetro "ids" no puede estar vacío'}), 400
+    
+    if len(ids) > MULTI_GET_MAX_IDS:
+        return jsonify({'error': f'Se permiten como máximo {MULTI_GET_MAX_IDS} ids por consulta'}), 400
+    
+    found = fetch_items(table, ids)
+    present = [id for id in ids if id in found]
+    
+    response = jsonify([found[id][0] for id in present])
+    response.headers['X-Item-ETags'] = ', '.join(f'{id}="{found[id][1]}"' for id in present)
+    return response
+
+# ==================== AGRUPACIÓN DE PETICIONES ====================
+
+# Tiempo máximo (en segundos) que una petición espera la respuesta de otra idéntica en curso
+COALESCE_TIMEOUT = float(os.environ.get('COALESCE_TIMEOUT', 10))
+
+class CoalescedCall:
+    """Resultado compartido de una llamada en curso"""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """Agrupa llamadas concurrentes con la misma clave: una calcula y las demás comparten el resultado"""
+    
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+    
+    def do(self, key, fn, timeout):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = CoalescedCall()
+        
+        if not leader:
+            if not call.done.wait(timeout):
+                raise TimeoutError(f'La llamada agrupada no terminó en {timeout} s')
+            if call.error is not None:
+                raise call.error
+            return call.result
+        
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+request_coalescer = SingleFlight()
+
+def coalesce(view):
+    """Agrupa peticiones GET concurrentes a la misma ruta y con la misma query string"""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        # Con caché compartida, solo se agrupan peticiones que leyeron la misma generación:
+        # una llegada tras una escritura no recibe (ni guarda) un cálculo iniciado antes
+        key = (request.path, tuple(sorted(request.args.items(multi=True))), g.get('cache_generation'))
+        
+        def compute():
+            # Se comparte el cuerpo ya serializado; cada petición construye su propia respuesta
+            response = app.make_response(view(*args, **kwargs))
+            if g.get('query_aborted'):
+                # Las peticiones agrupadas reciben el mismo error de presupuesto
+                raise QueryDeadlineExceeded(g.query_aborted)
+            return response.get_data(), response.status_code, list(response.headers.items())
+        
+        try:
+            body, status, headers = request_coalescer.do(key, compute, COALESCE_TIMEOUT)
+        except TimeoutError:
+            return jsonify({'error': 'Tiempo de espera agotado al obtener la respuesta'}), 504
+        except QueryDeadlineExceeded as e:
+            g.query_aborted = e.reason
+            return query_deadline_response(e.reason)
+        return app.response_class(body, status=status, headers=headers)
+    return wrapper
 
 @app.route('/health', methods=['GET'])
 def health_check():
@@ -237,19 +1279,178 @@ def home():
         }
     }), 200
 
+# ==================== CACHÉ COMPARTIDA ====================
+
+# Archivo mapeado en memoria compartido por los workers; sin definir, la caché está desactivada.
+# Conviene ubicarlo en un tmpfs como /dev/shm.
+SHARED_CACHE_FILE = os.environ.get('SHARED_CACHE_FILE')
+SHARED_CACHE_SLOTS = int(os.environ.get('SHARED_CACHE_SLOTS', 256))
+SHARED_CACHE_SLOT_SIZE = int(os.environ.get('SHARED_CACHE_SLOT_SIZE', 256 * 1024))
+
+class SharedResponseCache:
+    """Caché de respuestas serializadas compartida entre workers mediante un archivo mapeado
+    
+    El archivo tiene una cabecera, un índice de ranuras y una zona de datos con una
+    región fija por ranura. Cada clave ocupa la ranura que le asigna su hash; una
+    colisión reemplaza la entrada anterior. Las entradas guardan la generación de la
+    sección y solo son válidas mientras esta no cambie. Los procesos se coordinan con
+    flock (lecturas compartidas, escrituras exclusivas).
+    
+    El nombre del archivo incluye ranuras y tamaño de ranura, de modo que workers con
+    otra configuración usan otro archivo. Un archivo mapeado nunca se trunca (otro
+    proceso recibiría SIGBUS al leerlo): si no es válido se crea uno nuevo y se
+    renombra en su lugar.
+    """
+    
+    MAGIC = b'JMLCACH1'
+    HEADER = struct.Struct('<8sII')  # magic, ranuras, tamaño de ranura
+    ENTRY = struct.Struct('<16sqII')  # hash de la clave, generación, long. cabeceras, long. cuerpo
+    
+    def __init__(self, path, slots, slot_size):
+        self.path = f'{path}.{slots}x{slot_size}'
+        self.slots = slots
+        self.slot_size = slot_size
+        self.index_offset = self.HEADER.size
+        self.data_offset = self.index_offset + slots * self.ENTRY.size
+        self.size = self.data_offset + slots * slot_size
+        self._fd = None
+        self._map = None
+        self._pid = None
+        self._lock = threading.Lock()
+    
+    def _open(self):
+        # Cada proceso abre su propio descriptor: los bloqueos flock se heredan en el fork
+        if self._pid == os.getpid():
+            return
+        header = self.HEADER.pack(self.MAGIC, self.slots, self.slot_size)
+        while True:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            current = valid = False
+            try:
+                # Si otro proceso reemplazó el archivo mientras esperábamos el bloqueo, se reabre
+                current = os.fstat(fd).st_ino == os.stat(self.path).st_ino
+                valid = os.pread(fd, self.HEADER.size, 0) == header and os.fstat(fd).st_size == self.size
+                if current and valid:
+                    break
+                if not current:
+                    continue
+                tmp = f'{self.path}.{os.getpid()}.tmp'
+                tmp_fd = os.open(tmp, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o600)
+                try:
+                    os.ftruncate(tmp_fd, self.size)
+                    os.pwrite(tmp_fd, header, 0)
+                finally:
+                    os.close(tmp_fd)
+                os.rename(tmp, self.path)
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+                if not (current and valid):
+                    os.close(fd)
+        self._map = mmap.mmap(fd, self.size)
+        self._fd = fd
+        self._pid = os.getpid()
+    
+    def _slot(self, key):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        return digest, int.from_bytes(digest[:8], 'little') % self.slots
+    
+    def get(self, key, generation):
+        """Devuelve (cabeceras, cuerpo) si la entrada existe y es de la generación indicada"""
+        digest, slot = self._slot(key)
+        with self._lock:
+            self._open()
+            fcntl.flock(self._fd, fcntl.LOCK_SH)
+            try:
+                stored, stored_generation, headers_len, body_len = self.ENTRY.unpack_from(
+                    self._map, self.index_offset + slot * self.ENTRY.size
+                )
+                if stored != digest or stored_generation != generation:
+                    return None
+                start = self.data_offset + slot * self.slot_size
+                headers = self._map[start:start + headers_len]
+                body = self._map[start + headers_len:start + headers_len + body_len]
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        return json.loads(headers), body
+    
+    def put(self, key, generation, headers, body):
+        """Guarda una respuesta; las que no caben en una ranura no se guardan"""
+        headers = json.dumps(headers).encode('utf-8')
+        if len(headers) + len(body) > self.slot_size:
+            return
+        digest, slot = self._slot(key)
+        with self._lock:
+            self._open()
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                start = self.data_offset + slot * self.slot_size
+                self._map[start:start + len(headers) + len(body)] = headers + body
+                self.ENTRY.pack_into(
+                    self._map, self.index_offset + slot * self.ENTRY.size,
+                    digest, generation, len(headers), len(body)
+                )
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+# Requiere fcntl, por lo que en Windows la caché compartida queda desactivada
+shared_response_cache = (
+    SharedResponseCache(SHARED_CACHE_FILE, SHARED_CACHE_SLOTS, SHARED_CACHE_SLOT_SIZE)
+    if SHARED_CACHE_FILE and fcntl else None
+)
+
+def shared_cache(section):
+    """Sirve respuestas GET desde la caché compartida mientras la sección no cambie de generación"""
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            if shared_response_cache is None or 'ids' in request.args:
+                # ?ids= se arma desde la caché de elementos del proceso; no se comparte
+                return view(*args, **kwargs)
+            
+            key = f'{request.path}?{sorted(request.args.items(multi=True))}'
+            # La generación se lee antes de calcular: una escritura concurrente invalida lo guardado
+            conn = get_db_connection(section)
+            try:
+                generation = get_generation(conn, section)
+            finally:
+                conn.close()
+            g.cache_generation = generation
+            
+            cached = shared_response_cache.get(key, generation)
+            if cached:
+                headers, body = cached
+                return app.response_class(body, status=200, headers=headers)
+            
+            response = app.make_response(view(*args, **kwargs))
+            if response.status_code == 200 and not g.get('query_aborted'):
+                headers = [(k, v) for k, v in response.headers.items() if k != 'Content-Length']
+                shared_response_cache.put(key, generation, headers, response.get_data())
+            return response
+        return wrapper
+    return decorator
+
 # ==================== HORARIOS ====================
 
 @app.route('/api/horarios', methods=['GET'])
+@shared_cache('horarios')
+@coalesce
 def get_horarios():
     """Obtiene todos los horarios ordenados por fecha descendente"""
     try:
-        conn = get_db_connection()
+        if 'ids' in request.args:
+            return get_items_response('horarios', request.args['ids'])
+        
+        conn = get_db_connection('horarios')
         horarios = conn.execute(
             'SELECT * FROM horarios ORDER BY fecha DESC, created_at DESC'
         ).fetchall()
+        total = get_total(conn, 'horarios')
         conn.close()
         
-        return jsonify([dict(h) for h in horarios]), 200
+        response = jsonify(horarios)
+        response.headers['X-Total-Count'] = total
+        return response, 200
     except Exception as e:
         return jsonify({'error': 'Error al obtener horarios', 'details': str(e)}), 500
 
@@ -280,7 +1481,7 @@ def create_horario():
                 return jsonify({'error': 'El campo "fecha" debe estar en formato YYYY-MM-DD o ISO8601'}), 400
         
         # Crear horario
-        conn = get_db_connection()
+        conn = get_db_connection('horarios')
         cursor = conn.execute(
             '''INSERT INTO horarios (titulo, imagen, fecha, created_at) 
                VALUES (?, ?, ?, ?)''',
@@ -300,10 +1501,18 @@ def create_horario():
         ).fetchone()
         conn.close()
         
-        return jsonify(dict(horario)), 201
+        return jsonify(horario), 201
     except Exception as e:
         return jsonify({'error': 'Error al crear horario', 'details': str(e)}), 500
 
+@app.route('/api/horarios/<int:id>', methods=['GET'])
+def get_horario(id):
+    """Obtiene un horario por su id"""
+    try:
+        return get_item_response('horarios', id)
+    except Exception as e:
+        return jsonify({'error': 'Error al obtener horario', 'details': str(e)}), 500
+
 @app.route('/api/horarios/<int:id>', methods=['PUT'])
 def update_horario(id):
     """Actualiza un horario existente"""
@@ -313,7 +1522,7 @@ def update_horario(id):
         if not data:
             return jsonify({'error': 'No se enviaron datos'}), 400
         
-        conn = get_db_connection()
+        conn = get_db_connection('horarios')
         
         # Verificar que el horario existe
         horario = conn.execute('SELECT * FROM horarios WHERE id = ?', (id,)).fetchone()
@@ -345,6 +1554,7 @@ def update_horario(id):
             (titulo, imagen, fecha, id)
         )
         conn.commit()
+        item_cache.invalidate('horarios', id)
         
         # Obtener el horario actualizado
         horario_actualizado = conn.execute(
@@ -352,7 +1562,7 @@ def update_horario(id):
         ).fetchone()
         conn.close()
         
-        return jsonify(dict(horario_actualizado)), 200
+        return jsonify(horario_actualizado), 200
     except Exception as e:
         return jsonify({'error': 'Error al actualizar horario', 'details': str(e)}), 500
 
@@ -360,7 +1570,7 @@ def update_horario(id):
 def delete_horario(id):
     """Elimina un horario"""
     try:
-        conn = get_db_connection()
+        conn = get_db_connection('horarios')
         
         # Verificar que el horario existe
         horario = conn.execute('SELECT * FROM horarios WHERE id = ?', (id,)).fetchone()
@@ -371,6 +1581,7 @@ def delete_horario(id):
         # Eliminar horario
         conn.execute('DELETE FROM horarios WHERE id = ?', (id,))
         conn.commit()
+        item_cache.invalidate('horarios', id)
         conn.close()
         
         return jsonify({'message': 'Horario eliminado exitosamente'}), 200
@@ -379,16 +1590,27 @@ def delete_horario(id):
 # ==================== COMUNICADOS ====================
 
 @app.route('/api/comunicados', methods=['GET'])
+@shared_cache('comunicados')
+@coalesce
 def get_comunicados():
     """Obtiene todos los comunicados ordenados por fecha descendente"""
     try:
-        conn = get_db_connection()
-        comunicados = conn.execute(
-            'SELECT * FROM comunicados ORDER BY fecha DESC, created_at DESC'
-        ).fetchall()
+        if 'ids' in request.args:
+            return get_items_response('comunicados', request.args['ids'])
+        
+        conn = get_db_connection('comunicados')
+        query = 'SELECT * FROM comunicados'
+        if request.args.get('archivo') == '1':
+            query += ' UNION ALL SELECT * FROM comunicados_archivo'
+        comunicados = conn.execute(query + ' ORDER BY fecha DESC, created_at DESC').fetchall()
+        total = get_total(conn, 'comunicados')
+        if request.args.get('archivo') == '1':
+            total += get_total(conn, 'comunicados_archivo')
         conn.close()
         
-        return jsonify([dict(c) for c in comunicados]), 200
+        response = jsonify(comunicados)
+        response.headers['X-Total-Count'] = total
+        return response, 200
     except Exception as e:
         return jsonify({'error': 'Error al obtener comunicados', 'details': str(e)}), 500
 
@@ -422,7 +1644,7 @@ def create_comunicado():
                 return jsonify({'error': 'El campo "fecha" debe estar en formato YYYY-MM-DD o ISO8601'}), 400
         
         # Crear comunicado
-        conn = get_db_connection()
+        conn = get_db_connection('comunicados')
         cursor = conn.execute(
             '''INSERT INTO comunicados (titulo, contenido, imagen, fecha, created_at) 
                VALUES (?, ?, ?, ?, ?)''',
@@ -443,10 +1665,18 @@ def create_comunicado():
         ).fetchone()
         conn.close()
         
-        return jsonify(dict(comunicado)), 201
+        return jsonify(comunicado), 201
     except Exception as e:
         return jsonify({'error': 'Error al crear comunicado', 'details': str(e)}), 500
 
+@app.route('/api/comunicados/<int:id>', methods=['GET'])
+def get_comunicado(id):
+    """Obtiene un comunicado por su id"""
+    try:
+        return get_item_response('comunicados', id)
+    except Exception as e:
+        return jsonify({'error': 'Error al obtener comunicado', 'details': str(e)}), 500
+
 @app.route('/api/comunicados/<int:id>', methods=['PUT'])
 def update_comunicado(id):
     """Actualiza un comunicado existente"""
@@ -456,7 +1686,9 @@ def update_comunicado(id):
         if not data:
             return jsonify({'error': 'No se enviaron datos'}), 400
         
-        conn = get_db_connection()
+        conn = get_db_connection('comunicados')
+        
+        restore_archived_row(conn, 'comunicados', id)
         
         # Verificar que el comunicado existe
         comunicado = conn.execute('SELECT * FROM comunicados WHERE id = ?', (id,)).fetchone()
@@ -489,6 +1721,7 @@ def update_comunicado(id):
             (titulo, contenido, imagen, fecha, id)
         )
         conn.commit()
+        item_cache.invalidate('comunicados', id)
         
         # Obtener el comunicado actualizado
         comunicado_actualizado = conn.execute(
@@ -496,7 +1729,7 @@ def update_comunicado(id):
         ).fetchone()
         conn.close()
         
-        return jsonify(dict(comunicado_actualizado)), 200
+        return jsonify(comunicado_actualizado), 200
     except Exception as e:
         return jsonify({'error': 'Error al actualizar comunicado', 'details': str(e)}), 500
 
@@ -504,7 +1737,9 @@ def update_comunicado(id):
 def delete_comunicado(id):
     """Elimina un comunicado"""
     try:
-        conn = get_db_connection()
+        conn = get_db_connection('comunicados')
+        
+        restore_archived_row(conn, 'comunicados', id)
         
         # Verificar que el comunicado existe
         comunicado = conn.execute('SELECT * FROM comunicados WHERE id = ?', (id,)).fetchone()
@@ -515,6 +1750,7 @@ def delete_comunicado(id):
         # Eliminar comunicado
         conn.execute('DELETE FROM comunicados WHERE id = ?', (id,))
         conn.commit()
+        item_cache.invalidate('comunicados', id)
         conn.close()
         
         return jsonify({'message': 'Comunicado eliminado exitosamente'}), 200
@@ -524,16 +1760,32 @@ def delete_comunicado(id):
 # ==================== BLOG ====================
 
 @app.route('/api/blog', methods=['GET'])
+@shared_cache('blog')
+@coalesce
 def get_blog():
-    """Obtiene todas las entradas del blog"""
+    """Obtiene todas las entradas del blog, opcionalmente filtradas por categoría"""
     try:
-        conn = get_db_connection()
-        blog = conn.execute(
-            'SELECT * FROM blog ORDER BY fecha DESC, created_at DESC'
-        ).fetchall()
+        if 'ids' in request.args:
+            return get_items_response('blog', request.args['ids'])
+        
+        conn = get_db_connection('blog')
+        categoria = request.args.get('categoria')
+        if categoria:
+            blog = conn.execute(
+                'SELECT * FROM blog WHERE categoria = ? ORDER BY fecha DESC, created_at DESC',
+                (categoria,)
+            ).fetchall()
+            total = get_total(conn, f'blog:{categoria}')
+        else:
+            blog = conn.execute(
+                'SELECT * FROM blog ORDER BY fecha DESC, created_at DESC'
+            ).fetchall()
+            total = get_total(conn, 'blog')
         conn.close()
         
-        return jsonify([dict(b) for b in blog]), 200
+        response = jsonify(blog)
+        response.headers['X-Total-Count'] = total
+        return response, 200
     except Exception as e:
         return jsonify({'error': 'Error al obtener blog', 'details': str(e)}), 500
 
@@ -566,7 +1818,7 @@ def create_blog():
             except ValueError:
                 return jsonify({'error': 'El campo "fecha" debe estar en formato YYYY-MM-DD o ISO8601'}), 400
         
-        conn = get_db_connection()
+        conn = get_db_connection('blog')
         cursor = conn.execute(
             '''INSERT INTO blog (titulo, contenido, categoria, imagen, fecha, created_at) 
                VALUES (?, ?, ?, ?, ?, ?)''',
@@ -587,10 +1839,18 @@ def create_blog():
         ).fetchone()
         conn.close()
         
-        return jsonify(dict(blog)), 201
+        return jsonify(blog), 201
     except Exception as e:
         return jsonify({'error': 'Error al crear entrada de blog', 'details': str(e)}), 500
 
+@app.route('/api/blog/<int:id>', methods=['GET'])
+def get_blog_entry(id):
+    """Obtiene una entrada de blog por su id"""
+    try:
+        return get_item_response('blog', id)
+    except Exception as e:
+        return jsonify({'error': 'Error al obtener entrada de blog', 'details': str(e)}), 500
+
 @app.route('/api/blog/<int:id>', methods=['PUT'])
 def update_blog(id):
     """Actualiza una entrada de blog"""
@@ -600,7 +1860,7 @@ def update_blog(id):
         if not data:
             return jsonify({'error': 'No se enviaron datos'}), 400
         
-        conn = get_db_connection()
+        conn = get_db_connection('blog')
         
         blog = conn.execute('SELECT * FROM blog WHERE id = ?', (id,)).fetchone()
         if not blog:
@@ -630,13 +1890,14 @@ def update_blog(id):
             (titulo, contenido, categoria, imagen, fecha, id)
         )
         conn.commit()
+        item_cache.invalidate('blog', id)
         
         blog_actualizado = conn.execute(
             'SELECT * FROM blog WHERE id = ?', (id,)
         ).fetchone()
         conn.close()
         
-        return jsonify(dict(blog_actualizado)), 200
+        return jsonify(blog_actualizado), 200
     except Exception as e:
         return jsonify({'error': 'Error al actualizar blog', 'details': str(e)}), 500
 
@@ -644,7 +1905,7 @@ def update_blog(id):
 def delete_blog(id):
     """Elimina una entrada de blog"""
     try:
-        conn = get_db_connection()
+        conn = get_db_connection('blog')
         
         blog = conn.execute('SELECT * FROM blog WHERE id = ?', (id,)).fetchone()
         if not blog:
@@ -653,6 +1914,7 @@ def delete_blog(id):
         
         conn.execute('DELETE FROM blog WHERE id = ?', (id,))
         conn.commit()
+        item_cache.invalidate('blog', id)
         conn.close()
         
         return jsonify({'message': 'Entrada de blog eliminada exitosamente'}), 200
@@ -662,16 +1924,27 @@ def delete_blog(id):
 # ==================== COMENTARIOS ====================
 
 @app.route('/api/comentarios', methods=['GET'])
+@shared_cache('comentarios')
+@coalesce
 def get_comentarios():
     """Obtiene todos los comentarios"""
     try:
-        conn = get_db_connection()
-        comentarios = conn.execute(
-            'SELECT * FROM comentarios ORDER BY fecha DESC, created_at DESC'
-        ).fetchall()
+        if 'ids' in request.args:
+            return get_items_response('comentarios', request.args['ids'])
+        
+        conn = get_db_connection('comentarios')
+        query = 'SELECT * FROM comentarios'
+        if request.args.get('archivo') == '1':
+            query += ' UNION ALL SELECT * FROM comentarios_archivo'
+        comentarios = conn.execute(query + ' ORDER BY fecha DESC, created_at DESC').fetchall()
+        total = get_total(conn, 'comentarios')
+        if request.args.get('archivo') == '1':
+            total += get_total(conn, 'comentarios_archivo')
         conn.close()
         
-        return jsonify([dict(c) for c in comentarios]), 200
+        response = jsonify(comentarios)
+        response.headers['X-Total-Count'] = total
+        return response, 200
     except Exception as e:
         return jsonify({'error': 'Error al obtener comentarios', 'details': str(e)}), 500
 
@@ -701,7 +1974,7 @@ def create_comentario():
             except ValueError:
                 return jsonify({'error': 'El campo "fecha" debe estar en formato YYYY-MM-DD o ISO8601'}), 400
         
-        conn = get_db_connection()
+        conn = get_db_connection('comentarios')
         cursor = conn.execute(
             '''INSERT INTO comentarios (titulo, contenido, imagen, fecha, created_at) 
                VALUES (?, ?, ?, ?, ?)''',
@@ -721,10 +1994,18 @@ def create_comentario():
         ).fetchone()
         conn.close()
         
-        return jsonify(dict(comentario)), 201
+        return jsonify(comentario), 201
     except Exception as e:
         return jsonify({'error': 'Error al crear comentario', 'details': str(e)}), 500
 
+@app.route('/api/comentarios/<int:id>', methods=['GET'])
+def get_comentario(id):
+    """Obtiene un comentario por su id"""
+    try:
+        return get_item_response('comentarios', id)
+    except Exception as e:
+        return jsonify({'error': 'Error al obtener comentario', 'details': str(e)}), 500
+
 @app.route('/api/comentarios/<int:id>', methods=['PUT'])
 def update_comentario(id):
     """Actualiza un comentario"""
@@ -734,7 +2015,8 @@ def update_comentario(id):
         if not data:
             return jsonify({'error': 'No se enviaron datos'}), 400
         
-        conn = get_db_connection()
+        conn = get_db_connection('comentarios')
+        restore_archived_row(conn, 'comentarios', id)
         
         comentario = conn.execute('SELECT * FROM comentarios WHERE id = ?', (id,)).fetchone()
         if not comentario:
@@ -763,13 +2045,14 @@ def update_comentario(id):
             (titulo, contenido, imagen, fecha, id)
         )
         conn.commit()
+        item_cache.invalidate('comentarios', id)
         
         comentario_actualizado = conn.execute(
             'SELECT * FROM comentarios WHERE id = ?', (id,)
         ).fetchone()
         conn.close()
         
-        return jsonify(dict(comentario_actualizado)), 200
+        return jsonify(comentario_actualizado), 200
     except Exception as e:
         return jsonify({'error': 'Error al actualizar comentario', 'details': str(e)}), 500
 
@@ -777,7 +2060,8 @@ def update_comentario(id):
 def delete_comentario(id):
     """Elimina un comentario"""
     try:
-        conn = get_db_connection()
+        conn = get_db_connection('comentarios')
+        restore_archived_row(conn, 'comentarios', id)
         
         comentario = conn.execute('SELECT * FROM comentarios WHERE id = ?', (id,)).fetchone()
         if not comentario:
@@ -786,6 +2070,7 @@ def delete_comentario(id):
         
         conn.execute('DELETE FROM comentarios WHERE id = ?', (id,))
         conn.commit()
+        item_cache.invalidate('comentarios', id)
         conn.close()
         
         return jsonify({'message': 'Comentario eliminado exitosamente'}), 200
@@ -795,16 +2080,24 @@ def delete_comentario(id):
 # ==================== DEPORTES ====================
 
 @app.route('/api/deportes', methods=['GET'])
+@shared_cache('deportes')
+@coalesce
 def get_deportes():
     """Obtiene todas las actividades deportivas"""
     try:
-        conn = get_db_connection()
+        if 'ids' in request.args:
+            return get_items_response('deportes', request.args['ids'])
+        
+        conn = get_db_connection('deportes')
         deportes = conn.execute(
             'SELECT * FROM deportes ORDER BY fecha DESC, created_at DESC'
         ).fetchall()
+        total = get_total(conn, 'deportes')
         conn.close()
         
-        return jsonify([dict(d) for d in deportes]), 200
+        response = jsonify(deportes)
+        response.headers['X-Total-Count'] = total
+        return response, 200
     except Exception as e:
         return jsonify({'error': 'Error al obtener deportes', 'details': str(e)}), 500
 
@@ -834,7 +2127,7 @@ def create_deporte():
             except ValueError:
                 return jsonify({'error': 'El campo "fecha" debe estar en formato YYYY-MM-DD o ISO8601'}), 400
         
-        conn = get_db_connection()
+        conn = get_db_connection('deportes')
         cursor = conn.execute(
             '''INSERT INTO deportes (titulo, contenido, imagen, fecha, created_at) 
                VALUES (?, ?, ?, ?, ?)''',
@@ -854,10 +2147,18 @@ def create_deporte():
         ).fetchone()
         conn.close()
         
-        return jsonify(dict(deporte)), 201
+        return jsonify(deporte), 201
     except Exception as e:
         return jsonify({'error': 'Error al crear actividad deportiva', 'details': str(e)}), 500
 
+@app.route('/api/deportes/<int:id>', methods=['GET'])
+def get_deporte(id):
+    """Obtiene una actividad deportiva por su id"""
+    try:
+        return get_item_response('deportes', id)
+    except Exception as e:
+        return jsonify({'error': 'Error al obtener actividad deportiva', 'details': str(e)}), 500
+
 @app.route('/api/deportes/<int:id>', methods=['PUT'])
 def update_deporte(id):
     """Actualiza una actividad deportiva"""
@@ -867,7 +2168,7 @@ def update_deporte(id):
         if not data:
             return jsonify({'error': 'No se enviaron datos'}), 400
         
-        conn = get_db_connection()
+        conn = get_db_connection('deportes')
         
         deporte = conn.execute('SELECT * FROM deportes WHERE id = ?', (id,)).fetchone()
         if not deporte:
@@ -896,13 +2197,14 @@ def update_deporte(id):
             (titulo, contenido, imagen, fecha, id)
         )
         conn.commit()
+        item_cache.invalidate('deportes', id)
         
         deporte_actualizado = conn.execute(
             'SELECT * FROM deportes WHERE id = ?', (id,)
         ).fetchone()
         conn.close()
         
-        return jsonify(dict(deporte_actualizado)), 200
+        return jsonify(deporte_actualizado), 200
     except Exception as e:
         return jsonify({'error': 'Error al actualizar actividad deportiva', 'details': str(e)}), 500
 
@@ -910,7 +2212,7 @@ def update_deporte(id):
 def delete_deporte(id):
     """Elimina una actividad deportiva"""
     try:
-        conn = get_db_connection()
+        conn = get_db_connection('deportes')
         
         deporte = conn.execute('SELECT * FROM deportes WHERE id = ?', (id,)).fetchone()
         if not deporte:
@@ -919,12 +2221,202 @@ def delete_deporte(id):
         
         conn.execute('DELETE FROM deportes WHERE id = ?', (id,))
         conn.commit()
+        item_cache.invalidate('deportes', id)
         conn.close()
         
         return jsonify({'message': 'Actividad deportiva eliminada exitosamente'}), 200
     except Exception as e:
         return jsonify({'error': 'Error al eliminar actividad deportiva', 'details': str(e)}), 500
 
+# ==================== LOTES ====================
+
+BATCH_MAX_OPERATIONS = int(os.environ.get('BATCH_MAX_OPERATIONS', 100))
+
+class BatchOperationError(Exception):
+    """Error de una operación del lote; todo el lote se revierte"""
+    
+    def __init__(self, index, status, message):
+        super().__init__(message)
+        self.index = index
+        self.status = status
+        self.message = message
+
+def is_valid_fecha(fecha):
+    """Indica si la fecha está en formato YYYY-MM-DD o ISO8601"""
+    if not isinstance(fecha, str):
+        return False
+    try:
+        datetime.fromisoformat(fecha.replace('Z', '+00:00'))
+    except ValueError:
+        try:
+            datetime.strptime(fecha, '%Y-%m-%d')
+        except ValueError:
+            return False
+    return True
+
+def validate_batch_operation(index, operation):
+    """Valida una operación del lote antes de ejecutar ninguna"""
+    if not isinstance(operation, dict):
+        raise BatchOperationError(index, 400, 'Cada operación debe ser un objeto')
+    
+    op = operation.get('op')
+    if op not in ('create', 'update', 'delete'):
+        raise BatchOperationError(index, 400, 'El campo "op" debe ser "create", "update" o "delete"')
+    
+    section = SECTIONS.get(operation.get('section'))
+    if section is None:
+        raise BatchOperationError(index, 400, f'El campo "section" debe ser uno de: {", ".join(SECTIONS)}')
+    
+    if op in ('update', 'delete'):
+        if not isinstance(operation.get('id'), int) or isinstance(operation['id'], bool):
+            raise BatchOperationError(index, 400, 'El campo "id" es obligatorio y debe ser un entero')
+    
+    if op == 'delete':
+        return
+    
+    data = operation.get('data')
+    if not data or not isinstance(data, dict):
+        raise BatchOperationError(index, 400, 'No se enviaron datos')
+    
+    if op == 'create':
+        for field in section['required']:
+            if not data.get(field):
+                raise BatchOperationError(index, 400, f'El campo "{field}" es obligatorio')
+    
+    if 'fecha' in data and not is_valid_fecha(data['fecha']):
+        raise BatchOperationError(index, 400, 'El campo "fecha" debe estar en formato YYYY-MM-DD o ISO8601')
+
+def execute_batch_operation(conn, index, operation):
+    """Ejecuta una operación ya validada dentro de la transacción del lote"""
+    table = operation['section']
+    section = SECTIONS[table]
+    data = operation.get('data') or {}
+    
+    if operation['op'] == 'create':
+        fields = section['fields']
+        values = [data.get(field, '') for field in fields]
+        cursor = conn.execute(
+            f'''INSERT INTO {table} ({', '.join(fields)}, created_at)
+                VALUES ({', '.join('?' * (len(fields) + 1))})''',
+            values + [datetime.utcnow().isoformat() + 'Z']
+        )
+        row = conn.execute(f'SELECT * FROM {table} WHERE id = ?', (cursor.lastrowid,)).fetchone()
+        return {'index': index, 'status': 201, 'data': row}
+    
+    id = operation['id']
+    restore_archived_row(conn, table, id)
+    if not conn.execute(f'SELECT id FROM {table} WHERE id = ?', (id,)).fetchone():
+        raise BatchOperationError(index, 404, section['not_found'])
+    
+    if operation['op'] == 'delete':
+        conn.execute(f'DELETE FROM {table} WHERE id = ?', (id,))
+        return {'index': index, 'status': 200, 'message': 'Eliminado exitosamente'}
+    
+    fields = [field for field in section['fields'] if field in data]
+    if fields:
+        conn.execute(
+            f'''UPDATE {table} SET {', '.join(f'{field} = ?' for field in fields)}
+                WHERE id = ?''',
+            [data[field] for field in fields] + [id]
+        )
+    row = conn.execute(f'SELECT * FROM {table} WHERE id = ?', (id,)).fetchone()
+    return {'index': index, 'status': 200, 'data': row}
+
+@app.route('/api/batch', methods=['POST'])
+def batch():
+    """Ejecuta una lista ordenada de operaciones sobre cualquier sección en una sola transacción
+    
+    Todas las operaciones se validan antes de ejecutar ninguna; si alguna falla,
+    se revierte el lote completo. En la disposición por secciones la transacción
+    abarca varios archivos adjuntos: SQLite la revierte entera ante un error,
+    pero en modo WAL la confirmación no es atómica frente a una caída del sistema.
+    """
+    try:
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({'error': 'No se enviaron datos'}), 400
+        
+        operations = data.get('operations') if isinstance(data, dict) else data
+        if not isinstance(operations, list) or not operations:
+            return jsonify({'error': 'El campo "operations" debe ser una lista no vacía'}), 400
+        
+        if len(operations) > BATCH_MAX_OPERATIONS:
+            return jsonify({'error': f'Se permiten como máximo {BATCH_MAX_OPERATIONS} operaciones por lote'}), 400
+        
+        try:
+            for index, operation in enumerate(operations):
+                validate_batch_operation(index, operation)
+        except BatchOperationError as e:
+            return jsonify({'error': e.message, 'index': e.index}), e.status
+        
+        sections = list(dict.fromkeys(operation['section'] for operation in operations))
+        conn = get_db_connection(*sections)
+        # Tomar el bloqueo de escritura desde el inicio: un solo commit para todo el lote
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            results = [
+                execute_batch_operation(conn, index, operation)
+                for index, operation in enumerate(operations)
+            ]
+            conn.commit()
+        except BatchOperationError as e:
+            conn.rollback()
+            conn.close()
+            return jsonify({'error': e.message, 'index': e.index}), e.status
+        except Exception:
+            conn.rollback()
+            conn.close()
+            raise
+        conn.close()
+        
+        for operation in operations:
+            if operation['op'] != 'create':
+                item_cache.invalidate(operation['section'], operation['id'])
+        
+        return jsonify({'results': results}), 200
+    except Exception as e:
+        return jsonify({'error': 'Error al ejecutar el lote', 'details': str(e)}), 500
+
+# ==================== ADMINISTRACIÓN ====================
+
+@app.route('/api/admin/slow-queries', methods=['GET'])
+def get_slow_queries():
+    """Lista las formas de consulta más lentas registradas desde el arranque"""
+    try:
+        top = int(request.args.get('top', 10))
+    except ValueError:
+        return jsonify({'error': 'El parámetro "top" debe ser un número entero'}), 400
+    
+    if top < 1:
+        return jsonify({'error': 'El parámetro "top" debe ser mayor o igual a 1'}), 400
+    
+    with slow_query_lock:
+        stats = [dict(s) for s in slow_query_stats.values()]
+    
+    for s in stats:
+        s['avg_ms'] = round(s['total_ms'] / s['count'], 3)
+        s['total_ms'] = round(s['total_ms'], 3)
+        s['max_ms'] = round(s['max_ms'], 3)
+    stats.sort(key=lambda s: s['max_ms'], reverse=True)
+    
+    return jsonify({
+        'threshold_ms': SLOW_QUERY_MS,
+        'queries': stats[:top]
+    }), 200
+
+@app.route('/api/admin/query-deadlines', methods=['GET'])
+def get_query_deadlines():
+    """Muestra los presupuestos de tiempo configurados y las consultas abortadas"""
+    with query_deadline_lock:
+        aborted = dict(query_deadline_stats)
+    
+    return jsonify({
+        'default_ms': QUERY_DEADLINE_MS,
+        'routes': QUERY_DEADLINES,
+        'aborted': aborted
+    }), 200
+
 # ==================== MANEJO DE ERRORES ====================
 
 @app.errorhandler(404)
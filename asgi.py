@@ -0,0 +1,134 @@
+"""Modo de servicio asíncrono (ASGI) de la API
+
+Los handlers de Flask se ejecutan sin cambios. Este adaptador recibe cada
+petición en el event loop, ejecuta la aplicación (y con ella SQLite) en un pool
+de hilos acotado y envía la respuesta desde el event loop. Un cliente lento
+solo ocupa una corrutina mientras sube el cuerpo o descarga la respuesta, no un
+worker ni un hilo.
+
+Uso:
+    gunicorn asgi:application -c gunicorn_async.conf.py
+    uvicorn asgi:application --port 5000
+"""
+import asyncio
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from app import app
+
+# Hilos que ejecutan handlers (y consultas SQLite) en paralelo por proceso
+ASGI_THREADS = int(os.environ.get('ASGI_THREADS', 16))
+# Tamaño máximo del cuerpo de una petición, en bytes
+ASGI_MAX_BODY = int(os.environ.get('ASGI_MAX_BODY', 10 * 1024 * 1024))
+
+executor = ThreadPoolExecutor(max_workers=ASGI_THREADS, thread_name_prefix='handler')
+
+def build_environ(scope, body):
+    """Construye el environ WSGI a partir del scope ASGI"""
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope['query_string'].decode('latin-1'),
+        'SERVER_PROTOCOL': f"HTTP/{scope['http_version']}",
+        'SERVER_NAME': scope['server'][0] if scope.get('server') else 'localhost',
+        'SERVER_PORT': str(scope['server'][1]) if scope.get('server') else '80',
+        'REMOTE_ADDR': scope['client'][0] if scope.get('client') else '',
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': io.StringIO(),
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+        # El cuerpo ya está completo: Werkzeug puede leerlo aunque llegara por chunked
+        'wsgi.input_terminated': True
+    }
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin-1').upper().replace('-', '_')
+        if name not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            name = f'HTTP_{name}'
+        value = value.decode('latin-1')
+        environ[name] = f'{environ[name]},{value}' if name in environ else value
+    # La longitud real reemplaza a la declarada por el cliente (ausente con Transfer-Encoding: chunked)
+    environ['CONTENT_LENGTH'] = str(len(body))
+    return environ
+
+def run_wsgi(environ):
+    """Ejecuta la aplicación en un hilo del pool y devuelve (estado, cabeceras, cuerpo)"""
+    response = {}
+    chunks = []
+
+    def start_response(status, headers, exc_info=None):
+        if exc_info and response:
+            raise exc_info[1].with_traceback(exc_info[2])
+        response['status'] = int(status.split(' ', 1)[0])
+        response['headers'] = headers
+        return chunks.append
+
+    result = app(environ, start_response)
+    try:
+        for chunk in result:
+            chunks.append(chunk)
+    finally:
+        if hasattr(result, 'close'):
+            result.close()
+    return response['status'], response['headers'], b''.join(chunks)
+
+async def send_response(send, status, headers, body):
+    """Envía una respuesta completa al cliente"""
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(k.lower().encode('latin-1'), v.encode('latin-1')) for k, v in headers]
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+async def lifespan(receive, send):
+    """Atiende los eventos de arranque y apagado del servidor"""
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            executor.shutdown(wait=True)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+async def application(scope, receive, send):
+    """Aplicación ASGI que delega cada petición HTTP en Flask dentro del pool de hilos"""
+    if scope['type'] == 'lifespan':
+        return await lifespan(receive, send)
+    if scope['type'] != 'http':
+        # Sin soporte de websockets
+        if scope['type'] == 'websocket':
+            await send({'type': 'websocket.close'})
+        return
+
+    # El cuerpo se recibe en el event loop, sin ocupar un hilo
+    body = bytearray()
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return
+        body += message.get('body', b'')
+        if len(body) > ASGI_MAX_BODY:
+            return await send_response(
+                send, 413, [('Content-Type', 'application/json')],
+                b'{"error":"El cuerpo de la petici\\u00f3n es demasiado grande"}\n'
+            )
+        if not message.get('more_body'):
+            break
+
+    environ = build_environ(scope, bytes(body))
+    loop = asyncio.get_running_loop()
+    try:
+        status, headers, content = await loop.run_in_executor(executor, run_wsgi, environ)
+    except Exception:
+        app.logger.exception('Error al ejecutar la petición en el pool de hilos')
+        status, headers, content = (
+            500, [('Content-Type', 'application/json')],
+            b'{"error":"Error interno del servidor"}\n'
+        )
+    await send_response(send, status, headers, content)
@@ -0,0 +1,19 @@
+"""Configuración de gunicorn para el modo asíncrono (ASGI)
+
+Uso:
+    gunicorn asgi:application -c gunicorn_async.conf.py
+
+Cada worker de uvicorn atiende muchas conexiones a la vez en su event loop;
+las consultas a SQLite se ejecutan en un pool de ASGI_THREADS hilos por worker.
+El modo síncrono habitual (gunicorn app:app) no usa este archivo.
+"""
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+worker_class = 'uvicorn.workers.UvicornWorker'
+
+# Las conexiones en espera no ocupan hilos, así que pueden mantenerse vivas más tiempo
+keepalive = int(os.environ.get('KEEPALIVE', 30))
+timeout = int(os.environ.get('TIMEOUT', 30))
+graceful_timeout = 30
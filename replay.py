@@ -0,0 +1,126 @@
+"""Reproduce el tráfico capturado por la API (CAPTURE_FILE) y reporta latencias
+
+Uso:
+    python replay.py trafico.jsonl --base-url http://localhost:5000 --speed 1
+
+--speed 1 respeta el ritmo original, 10 lo acelera diez veces y 0 envía las
+peticiones tan rápido como lo permita --concurrency. Las peticiones se envían
+en el orden en que fueron capturadas.
+"""
+import argparse
+import json
+import re
+import sys
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+def load_records(path, methods):
+    """Lee el archivo JSONL y devuelve los registros ordenados por instante de llegada"""
+    records = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if methods and record['method'] not in methods:
+                continue
+            records.append(record)
+    records.sort(key=lambda r: r['ts'])
+    return records
+
+def route_of(record):
+    """Agrupa las rutas reemplazando los ids numéricos"""
+    path = re.sub(r'/\d+(?=/|$)', '/<id>', record['path'])
+    return f"{record['method']} {path}"
+
+def send(base_url, record, timeout):
+    """Envía una petición y devuelve (estado, latencia en ms, tamaño de la respuesta)"""
+    url = base_url.rstrip('/') + record['path']
+    if record.get('query'):
+        url += '?' + record['query']
+
+    body = record['body'].encode('utf-8') if record.get('body') else None
+    headers = {'Content-Type': record['content_type']} if record.get('content_type') else {}
+    req = urllib.request.Request(url, data=body, headers=headers, method=record['method'])
+
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            size = len(response.read())
+            status = response.status
+    except urllib.error.HTTPError as e:
+        size = len(e.read())
+        status = e.code
+    except (urllib.error.URLError, OSError):
+        size = 0
+        status = None
+    return status, (time.perf_counter() - start) * 1000, size
+
+def percentile(values, p):
+    """Percentil por el método del rango más cercano"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(p / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+def replay(records, base_url, speed, concurrency, timeout):
+    """Envía los registros respetando el ritmo indicado y devuelve los resultados en orden"""
+    futures = []
+    first_ts = records[0]['ts']
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for record in records:
+            if speed > 0:
+                delay = (record['ts'] - first_ts) / speed - (time.monotonic() - start)
+                if delay > 0:
+                    time.sleep(delay)
+            futures.append(pool.submit(send, base_url, record, timeout))
+    elapsed = time.monotonic() - start
+    return [f.result() for f in futures], elapsed
+
+def report(records, results, elapsed):
+    """Imprime las distribuciones de latencia por ruta y en total"""
+    groups = defaultdict(list)
+    for record, result in zip(records, results):
+        groups[route_of(record)].append((record, result))
+    groups['TOTAL'] = list(zip(records, results))
+
+    print(f"{'ruta':<40} {'n':>6} {'p50':>9} {'p90':>9} {'p99':>9} {'máx':>9} {'errores':>8} {'distintos':>9}")
+    for route, items in sorted(groups.items(), key=lambda item: (item[0] == 'TOTAL', item[0])):
+        latencies = [result[1] for _, result in items]
+        errors = sum(1 for _, result in items if result[0] is None or result[0] >= 500)
+        mismatches = sum(1 for record, result in items if result[0] != record.get('status'))
+        print(
+            f'{route:<40} {len(items):>6} '
+            f'{percentile(latencies, 50):>9.2f} {percentile(latencies, 90):>9.2f} '
+            f'{percentile(latencies, 99):>9.2f} {max(latencies):>9.2f} '
+            f'{errors:>8} {mismatches:>9}'
+        )
+    print(f'{len(records)} peticiones en {elapsed:.2f} s ({len(records) / max(elapsed, 1e-9):.1f} req/s); latencias en ms')
+
+def main():
+    parser = argparse.ArgumentParser(description='Reproduce tráfico capturado contra una instancia de la API')
+    parser.add_argument('file', help='Archivo JSONL generado con CAPTURE_FILE')
+    parser.add_argument('--base-url', default='http://localhost:5000')
+    parser.add_argument('--speed', type=float, default=1.0,
+                        help='Multiplicador del ritmo original; 0 envía sin pausas')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--timeout', type=float, default=30.0)
+    parser.add_argument('--methods', default='',
+                        help='Métodos a reproducir separados por comas, por ejemplo GET')
+    args = parser.parse_args()
+
+    methods = {m.strip().upper() for m in args.methods.split(',') if m.strip()}
+    records = load_records(args.file, methods)
+    if not records:
+        print('No hay peticiones para reproducir', file=sys.stderr)
+        return 1
+
+    results, elapsed = replay(records, args.base_url, args.speed, args.concurrency, args.timeout)
+    report(records, results, elapsed)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
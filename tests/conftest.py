@@ -0,0 +1,19 @@
+import importlib
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+@pytest.fixture(scope='session')
+def app_module(tmp_path_factory):
+    """Importa app.py dentro de un directorio temporal: init_db crea ahí comunicados.db"""
+    workdir = tmp_path_factory.mktemp('db')
+    previous = os.getcwd()
+    os.chdir(workdir)
+    try:
+        yield importlib.import_module('app')
+    finally:
+        os.chdir(previous)
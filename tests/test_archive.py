@@ -0,0 +1,54 @@
+def create_old(client, section):
+    response = client.post(f'/api/{section}', json={
+        'titulo': 'Antiguo', 'contenido': 'Texto', 'fecha': '2000-01-01'
+    })
+    assert response.status_code == 201
+    return response.get_json()['id']
+
+def archived_ids(app_module, table):
+    conn = app_module.get_db_connection(table)
+    ids = {row['id'] for row in conn.execute(f'SELECT id FROM {table}_archivo').fetchall()}
+    conn.close()
+    return ids
+
+def test_archived_rows_can_be_updated_and_deleted(app_module):
+    client = app_module.app.test_client()
+    for section in app_module.ARCHIVED_TABLES:
+        id = create_old(client, section)
+        app_module.archive_old_rows()
+        assert id in archived_ids(app_module, section)
+        total = int(client.get(f'/api/{section}?archivo=1').headers['X-Total-Count'])
+
+        response = client.put(f'/api/{section}/{id}', json={'titulo': 'Editado'})
+        assert response.status_code == 200
+        assert response.get_json()['titulo'] == 'Editado'
+        assert client.get(f'/api/{section}/{id}').get_json()['titulo'] == 'Editado'
+        assert id not in archived_ids(app_module, section)
+
+        app_module.archive_old_rows()
+        assert client.delete(f'/api/{section}/{id}').status_code == 200
+        assert client.get(f'/api/{section}/{id}').status_code == 404
+        assert int(client.get(f'/api/{section}?archivo=1').headers['X-Total-Count']) == total - 1
+
+def test_invalid_update_keeps_row_archived(app_module):
+    client = app_module.app.test_client()
+    id = create_old(client, 'comunicados')
+    app_module.archive_old_rows()
+
+    response = client.put(f'/api/comunicados/{id}', json={'fecha': 'ayer'})
+    assert response.status_code == 400
+    assert id in archived_ids(app_module, 'comunicados')
+
+def test_batch_modifies_archived_rows(app_module):
+    client = app_module.app.test_client()
+    updated = create_old(client, 'comunicados')
+    deleted = create_old(client, 'comentarios')
+    app_module.archive_old_rows()
+
+    response = client.post('/api/batch', json={'operations': [
+        {'op': 'update', 'section': 'comunicados', 'id': updated, 'data': {'titulo': 'Editado'}},
+        {'op': 'delete', 'section': 'comentarios', 'id': deleted}
+    ]})
+    assert response.status_code == 200
+    assert client.get(f'/api/comunicados/{updated}').get_json()['titulo'] == 'Editado'
+    assert client.get(f'/api/comentarios/{deleted}').status_code == 404
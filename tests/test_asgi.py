@@ -0,0 +1,49 @@
+import asyncio
+import json
+
+import pytest
+
+@pytest.fixture
+def asgi_module(app_module):
+    import asgi
+    return asgi
+
+def post(asgi_module, path, body, headers):
+    """Envía una petición por la aplicación ASGI, con el cuerpo partido en dos mensajes"""
+    scope = {
+        'type': 'http', 'method': 'POST', 'path': path, 'query_string': b'',
+        'http_version': '1.1', 'scheme': 'http', 'server': ('testserver', 80),
+        'client': ('127.0.0.1', 1234),
+        'headers': [(k.encode('latin-1'), v.encode('latin-1')) for k, v in headers]
+    }
+    half = len(body) // 2
+    messages = [
+        {'type': 'http.request', 'body': body[:half], 'more_body': True},
+        {'type': 'http.request', 'body': body[half:], 'more_body': False}
+    ]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(asgi_module.application(scope, receive, send))
+    return sent[0]['status'], b''.join(m.get('body', b'') for m in sent[1:])
+
+BODY = json.dumps({'titulo': 'Ensayo general', 'fecha': '2025-09-01'}).encode('utf-8')
+
+def test_post_with_content_length(asgi_module):
+    status, body = post(asgi_module, '/api/horarios', BODY, [
+        ('content-type', 'application/json'), ('content-length', str(len(BODY)))
+    ])
+    assert status == 201
+    assert json.loads(body)['titulo'] == 'Ensayo general'
+
+def test_post_chunked_without_content_length(asgi_module):
+    status, body = post(asgi_module, '/api/horarios', BODY, [
+        ('content-type', 'application/json'), ('transfer-encoding', 'chunked')
+    ])
+    assert status == 201
+    assert json.loads(body)['titulo'] == 'Ensayo general'
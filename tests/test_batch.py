@@ -0,0 +1,74 @@
+import pytest
+
+HORARIO = {'titulo': 'Ensayo', 'fecha': '2025-09-01'}
+BLOG = {'titulo': 'Concierto', 'contenido': 'Crónica', 'categoria': 'lote', 'fecha': '2025-09-01'}
+
+def count(app_module, table, where='', params=()):
+    conn = app_module.get_db_connection(table)
+    total = conn.execute(f'SELECT COUNT(*) FROM {table} {where}', params).fetchone()[0]
+    conn.close()
+    return total
+
+def total_header(client, path):
+    return int(client.get(path).headers['X-Total-Count'])
+
+def test_failed_operation_rolls_back_the_batch(app_module):
+    client = app_module.app.test_client()
+    horarios = count(app_module, 'horarios')
+    blog = count(app_module, 'blog')
+
+    response = client.post('/api/batch', json={'operations': [
+        {'op': 'create', 'section': 'horarios', 'data': HORARIO},
+        {'op': 'create', 'section': 'blog', 'data': BLOG},
+        {'op': 'delete', 'section': 'horarios', 'id': 999999}
+    ]})
+    assert response.status_code == 404
+    assert response.get_json() == {'error': 'Horario no encontrado', 'index': 2}
+    assert count(app_module, 'horarios') == horarios
+    assert count(app_module, 'blog') == blog
+    assert total_header(client, '/api/horarios') == horarios
+
+@pytest.mark.parametrize('operation, message', [
+    ({'op': 'upsert', 'section': 'horarios', 'data': HORARIO}, 'El campo "op"'),
+    ({'op': 'create', 'section': 'noticias', 'data': HORARIO}, 'El campo "section"'),
+    ({'op': 'create', 'section': 'horarios', 'data': {**HORARIO, 'fecha': 'ayer'}}, 'El campo "fecha"'),
+    ({'op': 'update', 'section': 'horarios', 'id': 1, 'data': {'fecha': '01/09/2025'}}, 'El campo "fecha"'),
+    ({'op': 'delete', 'section': 'horarios', 'id': '1'}, 'El campo "id"')
+])
+def test_validation_errors_run_nothing(app_module, operation, message):
+    client = app_module.app.test_client()
+    horarios = count(app_module, 'horarios')
+
+    response = client.post('/api/batch', json={'operations': [
+        {'op': 'create', 'section': 'horarios', 'data': HORARIO},
+        operation
+    ]})
+    assert response.status_code == 400
+    assert response.get_json()['index'] == 1
+    assert response.get_json()['error'].startswith(message)
+    assert count(app_module, 'horarios') == horarios
+
+def test_mixed_batch_updates_totals(app_module):
+    client = app_module.app.test_client()
+    created = client.post('/api/horarios', json=HORARIO).get_json()['id']
+    horarios = total_header(client, '/api/horarios')
+    blog = total_header(client, '/api/blog')
+    categoria = total_header(client, '/api/blog?categoria=lote')
+
+    response = client.post('/api/batch', json={'operations': [
+        {'op': 'create', 'section': 'horarios', 'data': HORARIO},
+        {'op': 'create', 'section': 'horarios', 'data': HORARIO},
+        {'op': 'delete', 'section': 'horarios', 'id': created},
+        {'op': 'create', 'section': 'blog', 'data': BLOG},
+        {'op': 'update', 'section': 'horarios', 'id': 1, 'data': {'titulo': 'Cambiado'}}
+    ]})
+    assert response.status_code == 200
+    results = response.get_json()['results']
+    assert [r['status'] for r in results] == [201, 201, 200, 201, 200]
+    assert results[4]['data']['titulo'] == 'Cambiado'
+
+    assert total_header(client, '/api/horarios') == horarios + 1 == count(app_module, 'horarios')
+    assert total_header(client, '/api/blog') == blog + 1 == count(app_module, 'blog')
+    assert total_header(client, '/api/blog?categoria=lote') == categoria + 1 == count(
+        app_module, 'blog', 'WHERE categoria = ?', ('lote',)
+    )
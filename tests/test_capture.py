@@ -0,0 +1,38 @@
+import json
+import threading
+import time
+
+def test_concurrent_first_records_start_one_writer(app_module, monkeypatch, tmp_path):
+    path = tmp_path / 'trafico.jsonl'
+    recorder = app_module.TrafficRecorder(str(path), 60, 1000)
+
+    starts = []
+    start = recorder._start
+
+    def slow_start():
+        # Amplía la ventana entre la comprobación del pid y el inicio
+        starts.append(threading.get_ident())
+        time.sleep(0.05)
+        start()
+
+    monkeypatch.setattr(recorder, '_start', slow_start)
+    barrier = threading.Barrier(16)
+
+    def worker(n):
+        barrier.wait()
+        for i in range(10):
+            recorder.record({'worker': n, 'i': i})
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    recorder.flush()
+
+    assert len(starts) == 1
+    lines = path.read_text(encoding='utf-8').splitlines()
+    assert len(lines) == 160
+    assert {(e['worker'], e['i']) for e in map(json.loads, lines)} == {
+        (n, i) for n in range(16) for i in range(10)
+    }
@@ -0,0 +1,83 @@
+import json
+import math
+import sqlite3
+from datetime import datetime
+
+import pytest
+from flask.json.provider import DefaultJSONProvider
+
+BACKENDS = ['stdlib', 'orjson', 'ujson']
+
+def installed(app_module, backend):
+    return {'orjson': app_module.orjson, 'ujson': app_module.ujson}.get(backend, json) is not None
+
+def samples(app_module):
+    """Pares (objeto a codificar, equivalente sin sqlite3.Row para el proveedor de Flask)"""
+    pairs = []
+    for table in app_module.TABLES:
+        conn = app_module.get_db_connection(table)
+        rows = conn.execute(f'SELECT * FROM {table}').fetchall()
+        conn.close()
+        pairs.append((rows, [dict(r) for r in rows]))
+        if rows:
+            pairs.append((rows[0], dict(rows[0])))
+    extra = {
+        'texto': 'Niño – “ñandú” / 🎺 </script>',
+        'fecha': datetime(2025, 9, 1, 8, 30),
+        'vacio': None,
+        'numeros': [0, -1, 1.5, 10 ** 15, True, False],
+        'anidado': {'b': [], 'a': {}}
+    }
+    pairs.append((extra, extra))
+    return pairs
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_dumps_fast_matches_flask_provider(app_module, backend):
+    if not installed(app_module, backend):
+        pytest.skip(f'{backend} no está instalado')
+    reference = DefaultJSONProvider(app_module.app)
+    provider = app_module.FastJSONProvider(app_module.app, backend)
+
+    for obj, plain in samples(app_module):
+        expected = reference.dumps(plain, separators=(',', ':'))
+        actual = provider.dumps_fast(obj).decode('utf-8')
+        if backend == 'stdlib':
+            # El respaldo stdlib debe coincidir byte a byte con Flask
+            assert actual == expected
+        else:
+            assert json.loads(actual) == json.loads(expected)
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_response_encodes_rows(app_module, backend):
+    if not installed(app_module, backend):
+        pytest.skip(f'{backend} no está instalado')
+    app_module.app.json = app_module.FastJSONProvider(app_module.app, backend)
+    try:
+        conn = app_module.get_db_connection('horarios')
+        rows = conn.execute('SELECT * FROM horarios').fetchall()
+        conn.close()
+        with app_module.app.app_context():
+            response = app_module.app.json.response(rows)
+        assert response.mimetype == 'application/json'
+        assert json.loads(response.get_data()) == [dict(r) for r in rows]
+    finally:
+        app_module.app.json = app_module.FastJSONProvider(
+            app_module.app, app_module.select_json_backend(app_module.JSON_BACKEND)
+        )
+
+def test_stdlib_backend_keeps_nan(app_module):
+    provider = app_module.FastJSONProvider(app_module.app, 'stdlib')
+    assert provider.dumps_fast({'n': math.nan}) == b'{"n":NaN}'
+
+def test_orjson_encodes_nan_as_null(app_module):
+    # Diferencia documentada en FastJSONProvider
+    if not installed(app_module, 'orjson'):
+        pytest.skip('orjson no está instalado')
+    provider = app_module.FastJSONProvider(app_module.app, 'orjson')
+    assert json.loads(provider.dumps_fast({'n': math.nan, 'i': math.inf})) == {'n': None, 'i': None}
+
+def test_row_default_hook(app_module):
+    conn = sqlite3.connect(':memory:')
+    conn.row_factory = sqlite3.Row
+    row = conn.execute("SELECT 1 AS id, 'x' AS titulo").fetchone()
+    assert app_module.FastJSONProvider.default(row) == {'id': 1, 'titulo': 'x'}
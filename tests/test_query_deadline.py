@@ -0,0 +1,34 @@
+import sqlite3
+import time
+
+import pytest
+from flask import g
+
+SLOW_SELECT = """WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 3000000)
+                 SELECT count(*) FROM n"""
+
+def test_reads_before_commit_are_interrupted(app_module):
+    with app_module.app.test_request_context():
+        g.query_deadline = time.monotonic() + 0.05
+        conn = app_module.get_db_connection('horarios')
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute(SLOW_SELECT).fetchone()
+        conn.close()
+        assert g.query_aborted == 'interrupted'
+
+def test_reads_after_commit_ignore_deadline(app_module):
+    with app_module.app.test_request_context():
+        g.query_deadline = time.monotonic() + 0.05
+        conn = app_module.get_db_connection('horarios')
+        cursor = conn.execute(
+            'INSERT INTO horarios (titulo, fecha, created_at) VALUES (?, ?, ?)',
+            ('Ensayo', '2025-09-01', '2025-09-01T00:00:00')
+        )
+        conn.commit()
+        # La lectura de la fila creada agota el presupuesto, pero la escritura ya se guardó
+        time.sleep(0.06)
+        assert conn.execute(SLOW_SELECT).fetchone()[0] == 3000000
+        row = conn.execute('SELECT * FROM horarios WHERE id = ?', (cursor.lastrowid,)).fetchone()
+        conn.close()
+        assert row['titulo'] == 'Ensayo'
+        assert g.get('query_aborted') is None
@@ -0,0 +1,42 @@
+import threading
+import time
+
+def test_write_during_coalesced_list_is_not_cached_as_new(app_module, monkeypatch, tmp_path):
+    client = app_module.app.test_client()
+    deporte_id = client.get('/api/deportes').get_json()[0]['id']
+    cache = app_module.SharedResponseCache(str(tmp_path / 'cache'), 16, 64 * 1024)
+    monkeypatch.setattr(app_module, 'shared_response_cache', cache)
+
+    # La primera lectura del total queda detenida hasta que la escritura termina
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+    get_total = app_module.get_total
+
+    def slow_get_total(conn, table):
+        calls.append(table)
+        if len(calls) == 1:
+            started.set()
+            release.wait(5)
+        return get_total(conn, table)
+
+    monkeypatch.setattr(app_module, 'get_total', slow_get_total)
+
+    first = threading.Thread(target=client.get, args=('/api/deportes',))
+    first.start()
+    assert started.wait(5)
+
+    response = client.put(f'/api/deportes/{deporte_id}', json={'titulo': 'Titulo actualizado'})
+    assert response.status_code == 200
+
+    # Llega tras la escritura mientras el cálculo anterior sigue en curso
+    second = threading.Thread(target=client.get, args=('/api/deportes',))
+    second.start()
+    time.sleep(0.2)
+    release.set()
+    first.join(5)
+    second.join(5)
+
+    listed = {d['id']: d for d in client.get('/api/deportes').get_json()}
+    assert listed[deporte_id]['titulo'] == 'Titulo actualizado'
+    assert client.get(f'/api/deportes/{deporte_id}').get_json()['titulo'] == 'Titulo actualizado'